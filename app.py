@@ -13,10 +13,19 @@ import subprocess
 import threading
 import re
 import platform
+import random
 import shutil
+import tempfile
+import signal
+import socket
 import hmac
+import queue
+import heapq
+import functools
+import copy
 from datetime import datetime, timedelta, timezone
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from urllib.parse import urlparse
 from flask import Flask, jsonify, request, send_from_directory, Response
 import requests
@@ -32,12 +41,23 @@ PRICING_BASIS_TEXT = f'美元/{PRICING_BASIS_LABEL}'
 REQUEST_LOG_PATTERN = re.compile(
     r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\].*\[gin_logger\.go:\d+\]\s+(\d+)\s+\|\s+(\S+)\s+\|([\d\s.]+)\|\s+(\w+)\s+"([^"]+)"'
 )
-HASH_VERSION_PATTERN = re.compile(r'^[0-9a-f]{7,40}$', re.IGNORECASE)
+# 增量统计日志时使用的正则（按字节匹配，时间戳固定在行首）
+_GIN_TS_RE = re.compile(rb'\A\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]')
+_GIN_STATUS_RE = re.compile(rb'\s(\d{3})\s')
+# 匹配日志时间格式: [2026-01-18 23:48:53]
+_LOG_TIME_RE = re.compile(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]')
+HASH_VERSION_PATTERN = re.compile(r'[0-9a-f]{7,40}', re.IGNORECASE | re.ASCII)
+# 访问日志行的字面量标记，用于在正则之前快速过滤
+GIN_LOG_MARKER = b'[gin_logger.go'
 EXCLUDED_LOG_PATHS = (
-    '"/v0/management/usage"',
-    '"/v0/management/',
-    '"/v1/models"',
+    b'"/v0/management/usage"',
+    b'"/v0/management/',
+    b'"/v1/models"',
 )
+# 排除路径合并为一个正则，每行只需一次扫描
+EXCLUDED_LOG_RE = re.compile(b'|'.join(re.escape(path) for path in EXCLUDED_LOG_PATHS)) if EXCLUDED_LOG_PATHS else None
+# 增量读取日志时的单次读取块大小
+LOG_READ_CHUNK_SIZE = 64 * 1024
 
 # 可选依赖
 try:
@@ -54,9 +74,59 @@ except ImportError:
     HAS_YAML = False
     print("Warning: pyyaml not installed. Config validation will be limited.")
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _json_dumps_bytes(obj, indent=False):
+    """序列化为 UTF-8 JSON 字节，优先使用 orjson；indent=True 时缩进 2 格"""
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2 if indent else orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+
+def _json_loads(raw):
+    """解析 JSON 字节/字符串，优先使用 orjson"""
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_load_file(path):
+    """读取 JSON 文件，优先使用 orjson"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return _json_loads(raw)
+
 from werkzeug.middleware.proxy_fix import ProxyFix
+from flask.json.provider import DefaultJSONProvider
+
+
+class PanelJSONProvider(DefaultJSONProvider):
+    """接口响应序列化：输出紧凑 JSON，安装 orjson 时用其编码；保留键排序以维持前端展示顺序"""
+    compact = True
+
+    def response(self, *args, **kwargs):
+        if HAS_ORJSON and not (self.compact is False or (self.compact is None and self._app.debug)):
+            obj = self._prepare_response_obj(args, kwargs)
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                body = orjson.dumps(obj, default=self.default, option=option)
+            except TypeError:
+                # orjson 无法处理的值（如超出 64 位的整数）回退到标准库
+                return super().response(obj)
+            return self._app.response_class(body, mimetype=self.mimetype)
+        return super().response(*args, **kwargs)
+
 
 app = Flask(__name__, static_folder='static', static_url_path='')
+app.json = PanelJSONProvider(app)
 app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
 
 # 配置
@@ -99,6 +169,8 @@ CONFIG = {
 }
 
 ENV_PREFIX = 'CLIPROXY_PANEL_'
+# 配置项 -> 环境变量名
+CONFIG_ENV_KEYS = {key: f'{ENV_PREFIX}{key.upper()}' for key in CONFIG}
 LEGACY_ENV_MAP = {
     'PANEL_USERNAME': 'panel_username',
     'PANEL_PASSWORD': 'panel_password',
@@ -133,15 +205,19 @@ USAGE_ANALYTICS_LIMITS = {
 }
 
 
+_TRUE_STRINGS = frozenset({'1', 'true', 'yes', 'on'})
+_FALSE_STRINGS = frozenset({'0', 'false', 'no', 'off'})
+
+
 def _parse_bool(value):
     if isinstance(value, bool):
         return value
     if value is None:
         return False
     value_str = str(value).strip().lower()
-    if value_str in {'1', 'true', 'yes', 'on'}:
+    if value_str in _TRUE_STRINGS:
         return True
-    if value_str in {'0', 'false', 'no', 'off'}:
+    if value_str in _FALSE_STRINGS:
         return False
     return False
 
@@ -149,16 +225,27 @@ def _parse_bool(value):
 def _parse_float(value, default=0.0):
     if value is None:
         return default
+    if isinstance(value, (int, float)):
+        return float(value)
     try:
         return float(value)
     except Exception:
         return default
 
 
+_dotenv_cache = {'key': None, 'data': {}}
+
+
 def _load_dotenv():
     env_path = os.path.join(BASE_DIR, '.env')
-    if not os.path.exists(env_path):
+    try:
+        st = os.stat(env_path)
+    except OSError:
         return {}
+    # .env 未变化时直接复用上次解析结果
+    cache_key = (st.st_mtime_ns, st.st_size)
+    if _dotenv_cache['key'] == cache_key:
+        return _dotenv_cache['data']
     values = {}
     try:
         with open(env_path, 'r', encoding='utf-8') as f:
@@ -174,6 +261,9 @@ def _load_dotenv():
                 values[key] = value
     except Exception as e:
         print(f"Warning: failed to load .env: {e}")
+        return values
+    _dotenv_cache['key'] = cache_key
+    _dotenv_cache['data'] = values
     return values
 
 
@@ -185,7 +275,10 @@ def _format_env_value(value):
 
 def _update_dotenv_values(updates):
     env_path = os.path.join(BASE_DIR, '.env')
-    env_updates = {f'{ENV_PREFIX}{key.upper()}': _format_env_value(val) for key, val in updates.items()}
+    env_updates = {
+        CONFIG_ENV_KEYS.get(key) or f'{ENV_PREFIX}{key.upper()}': _format_env_value(val)
+        for key, val in updates.items()
+    }
     lines = []
 
     if os.path.exists(env_path):
@@ -217,6 +310,7 @@ def _update_dotenv_values(updates):
     try:
         with open(env_path, 'w', encoding='utf-8') as f:
             f.write('\n'.join(new_lines) + '\n')
+        _dotenv_cache['key'] = None
         return True
     except Exception as e:
         print(f"Warning: failed to save .env: {e}")
@@ -242,15 +336,12 @@ def _apply_overrides(overrides):
 
 def load_config_overrides():
     env_overrides = {}
-    for key in CONFIG.keys():
-        env_key = f'{ENV_PREFIX}{key.upper()}'
-        if env_key in os.environ:
-            env_overrides[key] = os.environ[env_key]
-
-    dotenv_raw = _load_dotenv()
     dotenv_overrides = {}
-    for key in CONFIG.keys():
-        env_key = f'{ENV_PREFIX}{key.upper()}'
+    dotenv_raw = _load_dotenv()
+    environ = os.environ
+    for key, env_key in CONFIG_ENV_KEYS.items():
+        if env_key in environ:
+            env_overrides[key] = environ[env_key]
         if env_key in dotenv_raw:
             dotenv_overrides[key] = dotenv_raw[env_key]
 
@@ -271,7 +362,7 @@ def load_config_overrides():
 def _require_nonempty_config(key):
     value = str(CONFIG.get(key, '')).strip()
     if not value:
-        raise RuntimeError(f'Missing required configuration: {ENV_PREFIX}{key.upper()}')
+        raise RuntimeError(f'Missing required configuration: {CONFIG_ENV_KEYS[key]}')
     return value
 
 
@@ -444,6 +535,7 @@ load_config_overrides()
 validate_runtime_config()
 
 UPDATE_HISTORY_PATH = os.path.join(DATA_DIR, 'update_history.json')
+REQUEST_LOG_LIMIT = 100
 
 # 全局状态
 state = {
@@ -457,7 +549,7 @@ state = {
     'current_version': 'unknown',
     'latest_version': 'unknown',
     'auto_update_enabled': CONFIG['auto_update_enabled'],
-    'request_log': [],
+    'request_log': deque(maxlen=REQUEST_LOG_LIMIT),
     # 统计数据
     'stats': {
         'total_requests': 0,
@@ -467,12 +559,13 @@ state = {
         'output_tokens': 0,
         'cached_tokens': 0,
         'total_response_time': 0,
-        'requests_per_minute': deque(maxlen=60),
-        'requests_per_hour': deque(maxlen=24),
         'model_usage': {},
         'error_types': {},
-        'hourly_stats': deque(maxlen=24),
     },
+    # 统计数据版本号，每次修改持久化字段时递增，用于跳过无变化的保存
+    'stats_version': 0,
+    # 手动价格（float），首次使用时由 CONFIG 计算，/api/pricing 修改时更新
+    'pricing_floats': None,
     # 上次从 CLIProxyAPI 读取的快照值（用于计算增量）
     'last_snapshot': {
         'input_tokens': 0,
@@ -498,11 +591,12 @@ state = {
         'offset': 0,
         'last_size': 0,
         'last_mtime': None,
+        'last_inode': None,
         'total': 0,
         'success': 0,
         'failed': 0,
         'last_time': None,
-        'buffer': '',
+        'buffer': bytearray(),
         'base_total': 0,
         'base_success': 0,
         'base_failed': 0,
@@ -513,9 +607,44 @@ state = {
 
 log_lock = threading.Lock()
 log_stats_lock = threading.Lock()
+# 保证同一时间只有一个线程增量扫描日志文件
+log_scan_lock = threading.Lock()
 stats_lock = threading.Lock()
 persistent_stats_lock = threading.Lock()
 usage_sync_lock = threading.Lock()
+# 合并并发的健康检查，缓存失效时只执行一次
+health_check_lock = threading.Lock()
+
+
+def _recent_request_log(limit):
+    """返回最近 limit 条请求记录（request_log 为定长 deque，不支持切片）"""
+    # 先整体转为 list（C 层逐块复制指针）再切片，比 islice 跳过前段更快
+    # 记录中的 time 为 time.time() 浮点数，只在读取时格式化返回的部分
+    return [
+        dict(entry, time=datetime.fromtimestamp(entry['time']).isoformat())
+        for entry in list(state['request_log'])[-limit:]
+    ]
+
+
+def _bump_stats_version():
+    """标记持久化统计已变更（调用方需持有 stats_lock）"""
+    state['stats_version'] += 1
+
+
+def _atomic_write_json(path, payload):
+    """先写入同目录临时文件再替换，避免写入中途崩溃导致文件截断"""
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                    dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_json_dumps_bytes(payload))
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
 # ==================== 持久化统计系统 ====================
 PERSISTENT_STATS_FIELDS = (
@@ -534,15 +663,14 @@ def load_persistent_stats():
     def safe_int(v, default=0):
         try:
             return int(v)
-        except:
+        except (TypeError, ValueError):
             return default
     
     path = CONFIG.get('persistent_stats_path')
     if not path or not os.path.exists(path):
         return False
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _json_load_file(path)
         if not isinstance(data, dict):
             return False
         with stats_lock:
@@ -564,6 +692,7 @@ def load_persistent_stats():
                         state['last_snapshot'][key] = safe_int(data['last_snapshot'][key])
             # 同步 request_count
             state['request_count'] = state['stats']['total_requests']
+            _bump_stats_version()
         print(f"Loaded persistent stats: accumulated={state['accumulated_stats']}, last_snapshot={state['last_snapshot']}")
         return True
     except Exception as e:
@@ -578,15 +707,18 @@ def save_persistent_stats(force=False):
         return False
     with persistent_stats_lock:
         now = time.time()
-        # 限制保存频率，除非强制保存
+        # 限制保存频率，除非强制保存；数据无变化时直接跳过
         last_saved = getattr(save_persistent_stats, '_last_saved', 0)
         if not force and now - last_saved < 10:
             return False
+        if not force and state['stats_version'] == getattr(save_persistent_stats, '_last_version', None):
+            return False
         save_persistent_stats._last_saved = now
     
     try:
         os.makedirs(os.path.dirname(path), exist_ok=True)
         with stats_lock:
+            version = state['stats_version']
             payload = {
                 'total_requests': state['stats'].get('total_requests', 0),
                 'successful_requests': state['stats'].get('successful_requests', 0),
@@ -599,50 +731,125 @@ def save_persistent_stats(force=False):
                 'last_snapshot': dict(state.get('last_snapshot', {})),
                 'saved_at': datetime.now().isoformat(),
             }
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        _atomic_write_json(path, payload)
+        save_persistent_stats._last_version = version
         return True
     except Exception as e:
         print(f"Warning: failed to save persistent stats: {e}")
         return False
 
 
-def _persistent_stats_worker():
-    """后台线程：定期保存统计数据"""
-    while True:
-        time.sleep(30)  # 每30秒保存一次
-        try:
-            save_persistent_stats()
-        except Exception as e:
-            print(f"Warning: persistent stats worker error: {e}")
+# ==================== 后台定时任务 ====================
+class BackgroundScheduler:
+    """单线程定时调度器：周期任务共用一个线程，按下次运行时间维护最小堆"""
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._started = False
+        self._stopped = False
+
+    def add(self, name, interval, func, delay=0):
+        """注册任务；interval 为秒数或返回秒数的函数，None 表示只执行一次"""
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._heap, (time.monotonic() + delay, self._seq, name, interval, func))
+            self._cond.notify()
+
+    def start(self):
+        """启动调度线程"""
+        if self._started:
+            return
+        self._started = True
+        thread = threading.Thread(target=self._run, daemon=True, name='background-scheduler')
+        thread.start()
+
+    def stop(self):
+        """停止调度：唤醒调度线程并让其退出，正在执行的任务会先跑完"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    wait = self._heap[0][0] - time.monotonic() if self._heap else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._stopped:
+                    return
+                _, _, name, interval, func = heapq.heappop(self._heap)
+            try:
+                func()
+            except Exception as e:
+                print(f'[{datetime.now()}] Background task {name} failed: {e}')
+            if interval is None:
+                continue
+            try:
+                seconds = interval() if callable(interval) else interval
+            except Exception as e:
+                print(f'[{datetime.now()}] Background task {name} interval error: {e}')
+                seconds = 60
+            self.add(name, interval, func, delay=seconds)
+
+background_scheduler = BackgroundScheduler()
+
+
+def _handle_shutdown_signal(signum, frame):
+    """SIGTERM：停止定时任务并立即落盘统计数据，然后退出"""
+    background_scheduler.stop()
+    save_persistent_stats(force=True)
+    save_log_stats_state(force=True)
+    raise SystemExit(0)
+
+
+_persistent_stats_worker_state = {'started': False}
+
+
+def request_persistent_stats_save():
+    """请求路径修改统计后调用：定时任务注册后由其按 stats_version 定期落盘，否则直接同步保存"""
+    if _persistent_stats_worker_state['started']:
+        return False
+    return save_persistent_stats()
 
 
 def start_persistent_stats_worker():
-    """启动持久化统计后台线程"""
-    thread = threading.Thread(target=_persistent_stats_worker, daemon=True)
-    thread.start()
+    """注册持久化统计定时任务（每10秒检查一次，stats_version 未变化时直接跳过）"""
+    if _persistent_stats_worker_state['started']:
+        return
+    _persistent_stats_worker_state['started'] = True
+    background_scheduler.add('persistent_stats', 10, save_persistent_stats, delay=10)
 
 
 # ==================== 缓存系统 ====================
 class CacheManager:
-    """轻量级缓存管理器"""
-    def __init__(self):
+    """轻量级缓存管理器
+
+    读取不加锁（dict 单键读写在 CPython 下是原子的），写入时加锁并按写入顺序淘汰最旧条目。
+    时间戳使用 time.monotonic()，不受系统时间调整影响。
+    """
+    def __init__(self, max_entries=1024):
         self._cache = {}
         self._lock = threading.Lock()
+        self._max_entries = max_entries
 
     def get(self, key, max_age=5):
         """获取缓存值，max_age为秒数"""
-        with self._lock:
-            if key in self._cache:
-                value, timestamp = self._cache[key]
-                if time.time() - timestamp < max_age:
-                    return value
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[1] < max_age:
+            return entry[0]
         return None
 
     def set(self, key, value):
         """设置缓存值"""
         with self._lock:
-            self._cache[key] = (value, time.time())
+            # 先移除再插入，使最近写入的键排在末尾
+            self._cache.pop(key, None)
+            self._cache[key] = (value, time.monotonic())
+            while len(self._cache) > self._max_entries:
+                self._cache.pop(next(iter(self._cache)))
 
     def invalidate(self, key=None):
         """使缓存失效"""
@@ -654,6 +861,8 @@ class CacheManager:
 
 
 def _safe_int(value, default=0):
+    if type(value) is int:
+        return value
     try:
         return int(value)
     except Exception:
@@ -671,6 +880,28 @@ def _build_management_base_url():
     return _build_api_base_url()
 
 
+# 访问本机 CLIProxy API 的共享会话，复用 keep-alive 连接
+_management_session = requests.Session()
+_management_adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0)
+_management_session.mount('http://', _management_adapter)
+_management_session.mount('https://', _management_adapter)
+
+
+def _read_response_limited(response, limit):
+    """读取 stream=True 的响应体，最多 limit 字节；读完整时连接回到连接池，截断时直接关闭连接"""
+    chunks = []
+    size = 0
+    try:
+        for chunk in response.iter_content(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                break
+    finally:
+        response.close()
+    return b''.join(chunks)[:limit]
+
+
 def _management_headers():
     key = CONFIG.get('management_key', '')
     headers = {'Content-Type': 'application/json'}
@@ -695,24 +926,53 @@ def _normalize_named_items(items, name_key):
     return []
 
 
-def _extract_usage_tokens(obj):
+# usage 中 token 字段的候选键（按优先级）
+USAGE_INPUT_TOKEN_KEYS = ('input_tokens', 'input', 'prompt_tokens')
+USAGE_OUTPUT_TOKEN_KEYS = ('output_tokens', 'output', 'completion_tokens')
+USAGE_CACHED_TOKEN_KEYS = ('cached_tokens', 'cache')
+USAGE_REASONING_TOKEN_KEYS = ('reasoning_tokens', 'reasoning')
+USAGE_TOTAL_TOKEN_KEYS = ('total_tokens', 'total')
+USAGE_TOTAL_REQUEST_KEYS = ('total_requests', 'total')
+USAGE_API_TOTAL_REQUEST_KEYS = ('total_requests', 'total', 'requests')
+USAGE_SUCCESS_KEYS = ('success', 'successful_requests', 'success_count')
+USAGE_FAILURE_KEYS = ('failure', 'failed_requests', 'failure_count')
+
+
+def _as_list(obj):
+    """dict 取 values，list 原样返回，其他类型返回空元组"""
+    if isinstance(obj, list):
+        return obj
+    if isinstance(obj, dict):
+        return list(obj.values())
+    return ()
+
+
+def _first_present(obj, keys, default=0):
+    """返回 obj 中第一个存在的候选键的值"""
+    for key in keys:
+        if key in obj:
+            return obj[key]
+    return default
+
+
+def _usage_token_counts(obj):
+    """返回 (input, output, cached, total) 四元组"""
     if not isinstance(obj, dict):
-        return {
-            'input_tokens': 0,
-            'output_tokens': 0,
-            'cached_tokens': 0,
-            'total_tokens': 0,
-        }
+        return 0, 0, 0, 0
 
     tokens = obj.get('tokens') or obj.get('usage') or obj
-    input_tokens = _safe_int(tokens.get('input_tokens', tokens.get('input', tokens.get('prompt_tokens', 0))))
-    output_tokens = _safe_int(tokens.get('output_tokens', tokens.get('output', tokens.get('completion_tokens', 0))))
-    cached_tokens = _safe_int(tokens.get('cached_tokens', tokens.get('cache', 0)))
-    reasoning_tokens = _safe_int(tokens.get('reasoning_tokens', tokens.get('reasoning', 0)))
-    total_tokens = _safe_int(tokens.get('total_tokens', tokens.get('total', obj.get('total_tokens', 0))))
+    input_tokens = _safe_int(_first_present(tokens, USAGE_INPUT_TOKEN_KEYS))
+    output_tokens = _safe_int(_first_present(tokens, USAGE_OUTPUT_TOKEN_KEYS))
+    cached_tokens = _safe_int(_first_present(tokens, USAGE_CACHED_TOKEN_KEYS))
+    total_tokens = _safe_int(_first_present(tokens, USAGE_TOTAL_TOKEN_KEYS, obj.get('total_tokens', 0)))
     if total_tokens == 0:
+        reasoning_tokens = _safe_int(_first_present(tokens, USAGE_REASONING_TOKEN_KEYS))
         total_tokens = input_tokens + output_tokens + reasoning_tokens
+    return input_tokens, output_tokens, cached_tokens, total_tokens
+
 
+def _extract_usage_tokens(obj):
+    input_tokens, output_tokens, cached_tokens, total_tokens = _usage_token_counts(obj)
     return {
         'input_tokens': input_tokens,
         'output_tokens': output_tokens,
@@ -753,7 +1013,7 @@ def fetch_management_auth_files(use_cache=True):
 
     url = f'{_build_management_base_url()}/v0/management/auth-files'
     try:
-        resp = requests.get(url, headers=_management_headers(), timeout=6)
+        resp = _management_session.get(url, headers=_management_headers(), timeout=6)
         resp.raise_for_status()
         payload = resp.json() if resp.content else {}
         files = _extract_auth_file_items(payload)
@@ -1228,8 +1488,7 @@ def load_usage_snapshot_from_disk():
         return None
     try:
         if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _json_load_file(path)
     except Exception as e:
         print(f"Warning: failed to load usage snapshot: {e}")
     return None
@@ -1241,19 +1500,21 @@ def save_usage_snapshot(snapshot):
         return False
     try:
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        _atomic_write_json(path, snapshot)
         return True
     except Exception as e:
         print(f"Warning: failed to save usage snapshot: {e}")
         return False
 
 
+LOG_STATS_COUNTER_FIELDS = ('total', 'success', 'failed', 'base_total', 'base_success', 'base_failed')
+
 LOG_STATS_PERSIST_FIELDS = (
     'initialized',
     'offset',
     'last_size',
     'last_mtime',
+    'last_inode',
     'total',
     'success',
     'failed',
@@ -1280,8 +1541,7 @@ def load_log_stats_state():
     if not path or not os.path.exists(path):
         return False
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _json_load_file(path)
         if not isinstance(data, dict):
             return False
         with log_stats_lock:
@@ -1289,7 +1549,10 @@ def load_log_stats_state():
             for key in LOG_STATS_PERSIST_FIELDS:
                 if key in data:
                     log_state[key] = data[key]
-            log_state['buffer'] = ''
+            # 兼容旧格式：加载时统一转换为 int，热路径直接相加
+            for key in LOG_STATS_COUNTER_FIELDS:
+                log_state[key] = _safe_int(log_state.get(key, 0))
+            log_state['buffer'] = bytearray()
             state['log_stats'] = log_state
             state['log_stats_loaded'] = True
         return True
@@ -1309,19 +1572,61 @@ def save_log_stats_state(force=False):
         if not force and now - last_saved < 5:
             return False
         payload = {key: log_state.get(key) for key in LOG_STATS_PERSIST_FIELDS}
+        # 与上次写入内容相同时跳过
+        if not force and payload == getattr(save_log_stats_state, '_last_payload', None):
+            return False
         log_state['last_saved_ts'] = now
         state['log_stats'] = log_state
     if not _ensure_parent_dir(path):
         return False
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        _atomic_write_json(path, payload)
+        save_log_stats_state._last_payload = payload
         return True
     except Exception as e:
         print(f"Warning: failed to save log stats: {e}")
         return False
 
 
+# 日志统计保存请求队列，容量为 1，后台线程合并多次请求后统一写盘
+_log_stats_save_queue = queue.Queue(maxsize=1)
+_log_stats_saver_state = {'started': False}
+
+
+def request_log_stats_save():
+    """请求保存日志统计；后台保存线程未启动时直接同步保存"""
+    if not _log_stats_saver_state['started']:
+        return save_log_stats_state()
+    try:
+        _log_stats_save_queue.put_nowait(True)
+    except queue.Full:
+        pass
+    return True
+
+
+def _log_stats_saver_worker():
+    """后台线程：合并日志统计保存请求"""
+    while True:
+        _log_stats_save_queue.get()
+        time.sleep(1)  # 合并1秒内的保存请求
+        try:
+            save_log_stats_state(force=True)
+        except Exception as e:
+            print(f"Warning: log stats saver error: {e}")
+
+
+def start_log_stats_saver():
+    """启动日志统计保存后台线程"""
+    if _log_stats_saver_state['started']:
+        return
+    _log_stats_saver_state['started'] = True
+    thread = threading.Thread(target=_log_stats_saver_worker, daemon=True)
+    thread.start()
+
+
+_usage_snapshot_last = {'entry': None}
+
+
 def fetch_usage_snapshot(use_cache=True):
     cache_key = 'usage_snapshot'
     if use_cache:
@@ -1333,11 +1638,20 @@ def fetch_usage_snapshot(use_cache=True):
     url = f'{base_url}/v0/management/usage'
     headers = _management_headers()
     try:
-        resp = requests.get(url, headers=headers, timeout=5)
+        resp = _management_session.get(url, headers=headers, timeout=5)
         resp.raise_for_status()
+        body = resp.content
+        last = _usage_snapshot_last['entry']
+        if last is not None and last[0] == body:
+            # 上游数据未变化：复用上次解析的对象（聚合结果可按对象命中缓存），也无需重复写盘
+            snapshot = last[1]
+            cache.set(cache_key, snapshot)
+            return snapshot
         snapshot = resp.json()
         cache.set(cache_key, snapshot)
         save_usage_snapshot(snapshot)
+        if snapshot is not None:
+            _usage_snapshot_last['entry'] = (body, snapshot)
         return snapshot
     except Exception:
         snapshot = load_usage_snapshot_from_disk()
@@ -1346,71 +1660,69 @@ def fetch_usage_snapshot(use_cache=True):
         return snapshot
 
 
+_usage_aggregate_cache = {'entry': None}
+
+
 def aggregate_usage_snapshot(snapshot):
-    totals = {
-        'input_tokens': 0,
-        'output_tokens': 0,
-        'cached_tokens': 0,
-        'total_tokens': 0,
-    }
+    """聚合 usage 快照；与上次为同一对象时直接返回上次结果的副本"""
+    cached = _usage_aggregate_cache['entry']
+    if cached is not None and snapshot is not None and cached[0] is snapshot:
+        return dict(cached[1]), dict(cached[2])
+    totals, reqs = _aggregate_usage_snapshot(snapshot)
+    if snapshot is not None:
+        # 快照对象与结果作为一个元组整体替换，并发读取不会看到错配的组合
+        _usage_aggregate_cache['entry'] = (snapshot, dict(totals), dict(reqs))
+    return totals, reqs
+
+
+def _aggregate_usage_snapshot(snapshot):
     reqs = {
         'total_requests': 0,
         'success': 0,
         'failure': 0,
     }
     if not snapshot:
-        return totals, reqs
+        return {'input_tokens': 0, 'output_tokens': 0, 'cached_tokens': 0, 'total_tokens': 0}, reqs
 
     usage = snapshot.get('usage') if isinstance(snapshot, dict) else None
     if not isinstance(usage, dict):
         usage = snapshot if isinstance(snapshot, dict) else {}
 
-    top_total = _safe_int(usage.get('total_requests', usage.get('total', 0)))
-    top_success = _safe_int(usage.get('success', usage.get('successful_requests', usage.get('success_count', 0))))
-    top_failure = _safe_int(usage.get('failure', usage.get('failed_requests', usage.get('failure_count', 0))))
-
-    apis = usage.get('apis', [])
-    if isinstance(apis, dict):
-        apis = list(apis.values())
-    if not isinstance(apis, list):
-        apis = []
+    top_total = _safe_int(_first_present(usage, USAGE_TOTAL_REQUEST_KEYS))
+    top_success = _safe_int(_first_present(usage, USAGE_SUCCESS_KEYS))
+    top_failure = _safe_int(_first_present(usage, USAGE_FAILURE_KEYS))
 
     sum_total = 0
     sum_success = 0
     sum_failure = 0
+    sum_input = sum_output = sum_cached = sum_tokens = 0
 
-    for api in apis:
+    for api in _as_list(usage.get('apis')):
         if not isinstance(api, dict):
             continue
-        sum_total += _safe_int(api.get('total_requests', api.get('total', api.get('requests', 0))))
-        sum_success += _safe_int(api.get('success', api.get('successful_requests', api.get('success_count', 0))))
-        sum_failure += _safe_int(api.get('failure', api.get('failed_requests', api.get('failure_count', 0))))
+        sum_total += _safe_int(_first_present(api, USAGE_API_TOTAL_REQUEST_KEYS))
+        sum_success += _safe_int(_first_present(api, USAGE_SUCCESS_KEYS))
+        sum_failure += _safe_int(_first_present(api, USAGE_FAILURE_KEYS))
 
-        models = api.get('models', [])
-        if isinstance(models, dict):
-            models = list(models.values())
-        if not isinstance(models, list):
-            continue
-        for model in models:
+        for model in _as_list(api.get('models')):
             if not isinstance(model, dict):
                 continue
+            # 有明细时按明细累计，否则按模型汇总值累计
             details = model.get('details')
-            if isinstance(details, list) and details:
-                for detail in details:
-                    token_totals = _extract_usage_tokens(detail)
-                    totals['input_tokens'] += token_totals['input_tokens']
-                    totals['output_tokens'] += token_totals['output_tokens']
-                    totals['cached_tokens'] += token_totals['cached_tokens']
-                    totals['total_tokens'] += token_totals['total_tokens']
-            else:
-                token_totals = _extract_usage_tokens(model)
-                totals['input_tokens'] += token_totals['input_tokens']
-                totals['output_tokens'] += token_totals['output_tokens']
-                totals['cached_tokens'] += token_totals['cached_tokens']
-                totals['total_tokens'] += token_totals['total_tokens']
+            entries = details if isinstance(details, list) and details else (model,)
+            for entry in entries:
+                input_tokens, output_tokens, cached_tokens, total_tokens = _usage_token_counts(entry)
+                sum_input += input_tokens
+                sum_output += output_tokens
+                sum_cached += cached_tokens
+                sum_tokens += total_tokens
 
-    if totals['total_tokens'] == 0:
-        totals['total_tokens'] = _safe_int(usage.get('total_tokens', 0))
+    totals = {
+        'input_tokens': sum_input,
+        'output_tokens': sum_output,
+        'cached_tokens': sum_cached,
+        'total_tokens': sum_tokens or _safe_int(usage.get('total_tokens', 0)),
+    }
 
     if top_total > 0:
         reqs['total_requests'] = top_total
@@ -1539,12 +1851,20 @@ def _pick_pricing_auto_model_id():
     return 'openai/gpt-4o-mini'
 
 
+def _manual_pricing():
+    pricing = state.get('pricing_floats')
+    if pricing is None:
+        pricing = {
+            'input': _safe_float(CONFIG.get('pricing_input', 0.0)),
+            'output': _safe_float(CONFIG.get('pricing_output', 0.0)),
+            'cache': _safe_float(CONFIG.get('pricing_cache', 0.0)),
+        }
+        state['pricing_floats'] = pricing
+    return pricing
+
+
 def get_effective_pricing():
-    manual = {
-        'input': _safe_float(CONFIG.get('pricing_input', 0.0)),
-        'output': _safe_float(CONFIG.get('pricing_output', 0.0)),
-        'cache': _safe_float(CONFIG.get('pricing_cache', 0.0)),
-    }
+    manual = dict(_manual_pricing())
     meta = {
         'mode': 'manual',
         'source': 'manual',
@@ -1598,7 +1918,7 @@ def import_usage_snapshot(snapshot):
     url = f'{base_url}/v0/management/usage/import'
     headers = _management_headers()
     try:
-        resp = requests.post(url, headers=headers, json=snapshot, timeout=8)
+        resp = _management_session.post(url, headers=headers, json=snapshot, timeout=8)
         resp.raise_for_status()
         return True
     except Exception as e:
@@ -1606,21 +1926,15 @@ def import_usage_snapshot(snapshot):
         return False
 
 
-def _usage_snapshot_worker():
+def _import_usage_snapshot_from_disk():
     snapshot = load_usage_snapshot_from_disk()
     if snapshot:
         import_usage_snapshot(snapshot)
-    while True:
-        try:
-            fetch_usage_snapshot(use_cache=False)
-        except Exception:
-            pass
-        time.sleep(60)
 
 
 def start_usage_snapshot_worker():
-    thread = threading.Thread(target=_usage_snapshot_worker, daemon=True)
-    thread.start()
+    """启动时导入磁盘上的 usage 快照；定期拉取由 background_tasks 中的 sync_usage_state 完成"""
+    background_scheduler.add('usage_snapshot_import', None, _import_usage_snapshot_from_disk)
 
 
 def _read_file_first_line(path):
@@ -1633,7 +1947,9 @@ def _read_file_first_line(path):
     return None
 
 
-def get_system_info():
+@functools.lru_cache(maxsize=1)
+def _read_system_info():
+    """读取 CPU 型号/系统版本/云厂商，进程生命周期内不会变化，只读取一次"""
     info = {
         'cpu_model': None,
         'os_version': None,
@@ -1669,49 +1985,95 @@ def get_system_info():
     return info
 
 
-def get_cliproxy_process_usage():
-    if not HAS_PSUTIL:
-        return {'cpu_percent': 0.0, 'memory_bytes': 0, 'memory_percent': 0.0}
+def get_system_info():
+    return dict(_read_system_info())
+
+
+# 缓存已发现的 cliproxy 进程对象，避免每次都遍历全部进程
+_cliproxy_process_cache = {'proc': None, 'ts': 0.0}
+CLIPROXY_PROCESS_RESCAN_SECONDS = 60
+
+
+def _find_cliproxy_process():
+    """查找 cliproxy 进程（psutil.Process），进程存活且未过期时直接复用缓存"""
+    cached = _cliproxy_process_cache['proc']
+    if cached is not None and time.monotonic() - _cliproxy_process_cache['ts'] < CLIPROXY_PROCESS_RESCAN_SECONDS:
+        try:
+            if cached.is_running():
+                return cached
+        except psutil.Error:
+            pass
+
     target = CONFIG.get('cliproxy_service', 'cliproxy')
-    cpu_percent = 0.0
-    memory_bytes = 0
-    memory_percent = 0.0
+    found = None
     try:
-        for proc in psutil.process_iter(['name', 'cmdline', 'memory_info', 'memory_percent']):
+        for proc in psutil.process_iter(['name', 'cmdline']):
             name = (proc.info.get('name') or '').lower()
             cmdline = ' '.join(proc.info.get('cmdline') or []).lower()
             if target in name or target in cmdline:
-                try:
-                    cpu_percent = proc.cpu_percent(interval=0.0)
-                    mem_info = proc.info.get('memory_info')
-                    if mem_info:
-                        memory_bytes = getattr(mem_info, 'rss', 0)
-                    memory_percent = _safe_float(proc.info.get('memory_percent', 0.0))
-                    break
-                except Exception:
-                    continue
+                found = proc
+                break
     except Exception:
-        pass
+        found = None
+    _cliproxy_process_cache['proc'] = found
+    _cliproxy_process_cache['ts'] = time.monotonic()
+    return found
+
+
+def _sample_cliproxy_process():
+    """采样 cliproxy 进程的 CPU/内存（需要 psutil），未找到进程时 pid 为 None"""
+    sample = {
+        'cpu_percent': 0.0,
+        'memory_bytes': 0,
+        'memory_percent': 0.0,
+        'pid': None,
+        'create_time': None,
+    }
+    proc = _find_cliproxy_process()
+    if proc is not None:
+        try:
+            with proc.oneshot():
+                sample['cpu_percent'] = proc.cpu_percent(interval=None)
+                sample['memory_bytes'] = proc.memory_info().rss
+                sample['memory_percent'] = _safe_float(proc.memory_percent())
+                sample['create_time'] = proc.create_time()
+            sample['pid'] = proc.pid
+        except psutil.Error:
+            _cliproxy_process_cache['proc'] = None
+    return sample
+
+
+def get_cliproxy_process_usage():
+    if not HAS_PSUTIL:
+        return {'cpu_percent': 0.0, 'memory_bytes': 0, 'memory_percent': 0.0}
+    # 后台监控运行时直接读取其采样结果
+    sample = resource_monitor.get_cliproxy_usage() or _sample_cliproxy_process()
     return {
-        'cpu_percent': cpu_percent,
-        'memory_bytes': memory_bytes,
-        'memory_percent': memory_percent,
+        'cpu_percent': sample['cpu_percent'],
+        'memory_bytes': sample['memory_bytes'],
+        'memory_percent': sample['memory_percent'],
     }
 
 
+_QUOTE_EN_RE = re.compile(r'[A-Za-z]')
+_QUOTE_CN_RE = re.compile(r'[\u4e00-\u9fff]')
+# 作者行过长时的截断标点
+_AUTHOR_CUT_RE = re.compile(r'[。！？!?；;]')
+
+
 def _normalize_quote_text(text):
     if not text:
         return text
-    has_en = any('A' <= ch <= 'Z' or 'a' <= ch <= 'z' for ch in text)
-    has_cn = any('\u4e00' <= ch <= '\u9fff' for ch in text)
+    has_en = _QUOTE_EN_RE.search(text) is not None
+    has_cn = _QUOTE_CN_RE.search(text) is not None
     if has_en and has_cn and '（' in text and '）' in text:
         prefix, rest = text.split('（', 1)
         inside, suffix = rest.split('）', 1)
         prefix = prefix.strip()
         inside = inside.strip()
         if prefix and inside:
-            prefix_has_en = any('A' <= ch <= 'Z' or 'a' <= ch <= 'z' for ch in prefix)
-            inside_has_en = any('A' <= ch <= 'Z' or 'a' <= ch <= 'z' for ch in inside)
+            prefix_has_en = _QUOTE_EN_RE.search(prefix) is not None
+            inside_has_en = _QUOTE_EN_RE.search(inside) is not None
             if not prefix_has_en and inside_has_en:
                 return f"{inside}（{prefix}）{suffix}".strip()
     return text.strip()
@@ -1727,49 +2089,106 @@ def load_quotes():
         with open(path, 'r', encoding='utf-8', errors='ignore') as f:
             content = f.read()
         content = content.replace('\r\n', '\n').replace('\r', '\n')
-        markers = list(re.finditer('出自：', content))
-        if not markers:
+        # 按标记切分：每段开头是作者行，作者行之后到下一个标记之前是下一句语录
+        parts = content.split('出自：')
+        if len(parts) < 2:
             return []
-        last_end = 0
-        for idx, marker in enumerate(markers):
-            quote = content[last_end:marker.start()].strip()
-            next_marker_pos = markers[idx + 1].start() if idx + 1 < len(markers) else len(content)
-            author_block = content[marker.end():next_marker_pos]
-            author_line = author_block.split('\n', 1)[0].strip()
+        quote_block = parts[0]
+        for author_block in parts[1:]:
+            quote = quote_block.strip()
+            newline_pos = author_block.find('\n')
+            author_line = (author_block if newline_pos < 0 else author_block[:newline_pos]).strip()
             if len(author_line) > 80:
-                cut_positions = [author_line.find(p) for p in ['。', '！', '？', '!', '?', '；', ';']]
-                cut_positions = [p for p in cut_positions if p != -1]
-                if cut_positions:
-                    author_line = author_line[:min(cut_positions)].strip()
+                cut_match = _AUTHOR_CUT_RE.search(author_line)
+                if cut_match:
+                    author_line = author_line[:cut_match.start()].strip()
             quote = _normalize_quote_text(quote)
             if quote and author_line:
                 key = f"{quote}||{author_line}"
                 if key not in seen:
                     seen.add(key)
                     quotes.append({'text': quote, 'author': author_line})
-            last_end = marker.end() + len(author_line)
+            quote_block = author_block[len(author_line):]
     except Exception as e:
         print(f"Warning: failed to load quotes: {e}")
     return quotes
 
 
+_quotes_cache = {'key': None, 'quotes': [], 'authors': frozenset()}
+
+
+def get_quotes():
+    """获取语录列表，仅在文件 mtime/大小变化时重新解析"""
+    path = CONFIG.get('quotes_path')
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return []
+    key = (st.st_mtime_ns, st.st_size)
+    if _quotes_cache['key'] != key:
+        quotes = load_quotes()
+        _quotes_cache['quotes'] = quotes
+        _quotes_cache['authors'] = frozenset(q['author'] for q in quotes)
+        _quotes_cache['key'] = key
+    return _quotes_cache['quotes']
+
+
+def get_quote_authors():
+    """获取语录作者集合（随语录一同在重新解析时计算）"""
+    get_quotes()
+    return _quotes_cache['authors']
+
+
 def get_random_quote():
-    cached = cache.get('quotes_cache', max_age=30)
-    if cached is None:
-        cached = load_quotes()
-        cache.set('quotes_cache', cached)
-    if not cached:
+    quotes = get_quotes()
+    if not quotes:
         return {'text': '欢迎回来，祝你今天高效完成任务。', 'author': '系统'}
-    import random
-    return random.choice(cached)
+    return random.choice(quotes)
 
 cache = CacheManager()
 
 # ==================== 后台资源监控 ====================
+def _process_count():
+    """获取进程数：Linux 直接统计 /proc 下的数字目录，避免构造完整 PID 列表"""
+    try:
+        return sum(1 for name in os.listdir('/proc') if name[0].isdigit())
+    except OSError:
+        pass
+    try:
+        return len(psutil.pids())
+    except Exception:
+        return 0
+
+
+def _sample_system_details():
+    """采样较重的 psutil 指标（CPU频率/时间、每核使用率、交换分区、负载、进程数）"""
+    cpu_freq = psutil.cpu_freq()
+    cpu_times = psutil.cpu_times_percent(interval=0)
+    per_cpu = psutil.cpu_percent(percpu=True)
+    swap = psutil.swap_memory()
+
+    # 获取系统负载（Linux）
+    try:
+        load_avg = psutil.getloadavg()
+    except (AttributeError, OSError):
+        load_avg = (0, 0, 0)
+
+    return {
+        'cpu_freq': cpu_freq,
+        'cpu_times': cpu_times,
+        'per_cpu': per_cpu,
+        'swap': swap,
+        'load_avg': load_avg,
+        'process_count': _process_count(),
+    }
+
+
 class ResourceMonitor:
     """非阻塞资源监控器"""
     def __init__(self):
         self._cpu_percent = 0.0
+        self._cliproxy_usage = None
+        self._system_snapshot = None
         self._lock = threading.Lock()
         self._running = False
 
@@ -1783,21 +2202,40 @@ class ResourceMonitor:
 
     def _monitor_loop(self):
         """后台监控循环"""
+        if HAS_PSUTIL:
+            # 首次调用只建立基准，之后以两次调用的间隔作为采样窗口
+            psutil.cpu_percent(interval=None)
+            psutil.cpu_percent(interval=None, percpu=True)
+            psutil.cpu_times_percent(interval=None)
         while self._running:
+            time.sleep(3)  # 每3秒更新一次
             try:
                 if HAS_PSUTIL:
-                    cpu = psutil.cpu_percent(interval=1)  # 1秒采样
+                    cpu = psutil.cpu_percent(interval=None)
+                    cliproxy_usage = _sample_cliproxy_process()
+                    system_snapshot = _sample_system_details()
                     with self._lock:
                         self._cpu_percent = cpu
-            except:
+                        self._cliproxy_usage = cliproxy_usage
+                        self._system_snapshot = system_snapshot
+            except Exception:
                 pass
-            time.sleep(2)  # 每3秒更新一次(1秒采样+2秒等待)
 
     def get_cpu_percent(self):
         """获取CPU使用率（非阻塞）"""
         with self._lock:
             return self._cpu_percent
 
+    def get_cliproxy_usage(self):
+        """获取最近一次 cliproxy 进程采样（非阻塞），尚未采样时返回 None"""
+        with self._lock:
+            return self._cliproxy_usage
+
+    def get_system_snapshot(self):
+        """获取最近一次系统详情采样（非阻塞），尚未采样时返回 None"""
+        with self._lock:
+            return self._system_snapshot
+
 resource_monitor = ResourceMonitor()
 
 def run_cmd(cmd, timeout=60, cwd=None):
@@ -1819,11 +2257,14 @@ def run_cmd(cmd, timeout=60, cwd=None):
         return False, '', str(e)
 
 
+@functools.lru_cache(maxsize=None)
 def is_linux():
     return platform.system().lower() == 'linux'
 
 
+@functools.lru_cache(maxsize=None)
 def command_available(command):
+    # 进程生命周期内 PATH 中的命令基本不变，缓存查找结果
     return shutil.which(command) is not None
 
 
@@ -1862,6 +2303,41 @@ def _df_usage(path):
     }
 
 
+def _read_meminfo():
+    """直接解析 /proc/meminfo（无需 fork free 命令），返回与 _free_memory_usage 相同的结构"""
+    try:
+        with open('/proc/meminfo', 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    fields = {}
+    for line in data.splitlines():
+        key, _, rest = line.partition(b':')
+        if key in (b'MemTotal', b'MemAvailable'):
+            parts = rest.split()
+            if parts:
+                fields[key] = int(parts[0]) * 1024
+    total = fields.get(b'MemTotal')
+    available = fields.get(b'MemAvailable')
+    if not total or available is None:
+        return None
+    used = total - available
+    return {
+        'total': total,
+        'used': used,
+        'available': available,
+        'percent': round(used / total * 100, 1),
+    }
+
+
+def _linux_memory_usage():
+    """优先读取 /proc/meminfo，失败时回退到 free 命令"""
+    mem_usage = _read_meminfo()
+    if mem_usage is None and command_available('free'):
+        mem_usage = _free_memory_usage()
+    return mem_usage
+
+
 def _free_memory_usage():
     lines = _command_output_lines(['free', '-b'], timeout=5)
     mem_line = _first_matching_line(lines, 'Mem:')
@@ -1883,10 +2359,52 @@ def _free_memory_usage():
     }
 
 
+CLIPROXY_CMDLINE_MARKER = 'cliproxy -config'
+PROC_DIR = '/proc'
+
+
+def _scan_proc_for_cmdline(marker):
+    """扫描 /proc/<pid>/cmdline，返回命令行包含 marker 的最小 PID（与 pgrep -f 行为一致）"""
+    needle = marker.encode('utf-8')
+    own_pid = os.getpid()
+    try:
+        with os.scandir(PROC_DIR) as entries:
+            pids = sorted(int(entry.name) for entry in entries if entry.name.isdigit())
+    except OSError:
+        return None
+    for pid in pids:
+        if pid == own_pid:
+            continue
+        try:
+            with open(f'{PROC_DIR}/{pid}/cmdline', 'rb') as f:
+                cmdline = f.read()
+        except OSError:
+            continue
+        if needle in cmdline.replace(b'\0', b' '):
+            return str(pid)
+    return None
+
+
+def _proc_rss_bytes(pid):
+    """从 /proc/<pid>/status 读取 VmRSS（字节）"""
+    try:
+        with open(f'{PROC_DIR}/{pid}/status', 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
 def _cliproxy_pid():
-    if not _is_local_api_host() or not command_available('pgrep'):
+    if not _is_local_api_host():
+        return None
+    if os.path.isdir(PROC_DIR):
+        return _scan_proc_for_cmdline(CLIPROXY_CMDLINE_MARKER)
+    if not command_available('pgrep'):
         return None
-    lines = _command_output_lines(['pgrep', '-f', 'cliproxy -config'], timeout=5)
+    lines = _command_output_lines(['pgrep', '-f', CLIPROXY_CMDLINE_MARKER], timeout=5)
     return lines[0] if lines else None
 
 
@@ -1896,11 +2414,21 @@ def _service_control_supported():
 
 def _service_api_reachable():
     try:
-        resp = requests.get(_build_management_base_url(), timeout=2)
+        resp = _management_session.get(_build_management_base_url(), timeout=2)
         return True, f'API reachable at {_api_host()}:{_api_port()} (HTTP {resp.status_code})'
     except requests.RequestException as exc:
         return False, f'API not reachable at {_api_host()}:{_api_port()} ({exc})'
 
+def _systemctl_active_state(status_lines):
+    """从 systemctl status 输出中提取 Active: 行的状态（如 active/inactive/failed）"""
+    for line in status_lines:
+        stripped = line.strip()
+        if stripped.startswith('Active:'):
+            parts = stripped.split(None, 2)
+            return parts[1] if len(parts) > 1 else None
+    return None
+
+
 def get_service_status(use_cache=True):
     """获取服务状态（带缓存）"""
     cache_key = 'service_status'
@@ -1914,13 +2442,19 @@ def get_service_status(use_cache=True):
     is_running = False
 
     if _service_control_supported():
-        success, stdout, _ = run_cmd(['systemctl', 'is-active', CONFIG['cliproxy_service']])
-        is_running = success and stdout == 'active'
         _, systemctl_status, _ = run_cmd(
             ['systemctl', 'status', CONFIG['cliproxy_service'], '--no-pager', '-l'],
             timeout=10,
         )
-        status_out = '\n'.join(systemctl_status.splitlines()[:20]).strip()
+        status_lines = systemctl_status.splitlines()[:20]
+        status_out = '\n'.join(status_lines).strip()
+        # 直接从 status 输出的 Active: 行判断运行状态，省去一次 is-active 调用
+        active_state = _systemctl_active_state(status_lines)
+        if active_state is None:
+            success, stdout, _ = run_cmd(['systemctl', 'is-active', CONFIG['cliproxy_service']])
+            is_running = success and stdout == 'active'
+        else:
+            is_running = active_state == 'active'
     else:
         is_running, status_out = _service_api_reachable()
 
@@ -1937,21 +2471,34 @@ def get_service_status(use_cache=True):
     if pid_out:
         if HAS_PSUTIL:
             try:
-                proc = psutil.Process(int(pid_out))
-                memory = f'{proc.memory_info().rss / 1024 / 1024:.1f} MB'
+                # 优先使用后台监控的进程采样，PID 不一致时再直接查询
+                sample = resource_monitor.get_cliproxy_usage()
+                if sample and str(sample.get('pid')) == str(pid_out):
+                    rss_bytes = sample['memory_bytes']
+                    create_time = sample['create_time']
+                else:
+                    proc = psutil.Process(int(pid_out))
+                    with proc.oneshot():
+                        rss_bytes = proc.memory_info().rss
+                        create_time = proc.create_time()
+                memory = f'{rss_bytes / 1024 / 1024:.1f} MB'
                 # 使用后台监控的CPU数据，避免阻塞
                 cpu = f'{resource_monitor.get_cpu_percent():.1f}%'
-                uptime_seconds = time.time() - proc.create_time()
+                uptime_seconds = time.time() - create_time
                 uptime = format_uptime(uptime_seconds)
-            except:
+            except Exception:
                 pass
-        elif command_available('ps'):
-            _, mem_out, _ = run_cmd(['ps', '-o', 'rss=', '-p', pid_out])
-            if mem_out:
-                try:
-                    memory = f'{int(mem_out) / 1024:.1f} MB'
-                except:
-                    pass
+        else:
+            rss_bytes = _proc_rss_bytes(pid_out)
+            if rss_bytes is not None:
+                memory = f'{rss_bytes / 1024 / 1024:.1f} MB'
+            elif command_available('ps'):
+                _, mem_out, _ = run_cmd(['ps', '-o', 'rss=', '-p', pid_out])
+                if mem_out:
+                    try:
+                        memory = f'{int(mem_out) / 1024:.1f} MB'
+                    except ValueError:
+                        pass
 
     result = {
         'running': is_running,
@@ -1981,6 +2528,13 @@ def format_uptime(seconds):
         return f'{days}天{hours}小时'
 
 
+# 访问 GitHub 的共享会话，跨轮询复用 TLS 连接
+_github_session = requests.Session()
+_github_session.headers.update({'User-Agent': 'CLIProxyPanel'})
+# 上次 releases/latest 响应的 ETag 与版本号，缓存过期后用于条件请求（304 不计入限流）
+_github_release_etag = {'etag': None, 'version': None}
+
+
 def get_github_release_version():
     """从GitHub releases获取最新版本号（带缓存）"""
     cache_key = 'github_release'
@@ -1995,7 +2549,6 @@ def get_github_release_version():
 
         def api_headers():
             headers = {
-                'User-Agent': 'CLIProxyPanel',
                 'Accept': 'application/vnd.github+json',
             }
             token = (os.environ.get('CLIPROXY_PANEL_GITHUB_TOKEN') or os.environ.get('GITHUB_TOKEN') or '').strip()
@@ -2004,28 +2557,41 @@ def get_github_release_version():
             return headers
 
         try:
-            resp = requests.get(api_url, headers=api_headers(), timeout=10)
+            headers = api_headers()
+            known_version = _github_release_etag['version']
+            if _github_release_etag['etag'] and known_version:
+                headers['If-None-Match'] = _github_release_etag['etag']
+            resp = _github_session.get(api_url, headers=headers, timeout=10)
+            if resp.status_code == 304 and known_version:
+                cache.set(cache_key, known_version)
+                return known_version
             if resp.status_code == 200:
                 data = resp.json() if resp.content else {}
                 version = (data.get('tag_name') if isinstance(data, dict) else None) or 'unknown'
+                if version != 'unknown':
+                    _github_release_etag['etag'] = resp.headers.get('ETag')
+                    _github_release_etag['version'] = version
                 cache.set(cache_key, version)
                 return version
+            if resp.status_code in (403, 429) and known_version:
+                # 被限流时沿用上次结果，等缓存过期后再试
+                print(f'get_github_release_version rate limited (HTTP {resp.status_code}), reuse {known_version}')
+                cache.set(cache_key, known_version)
+                return known_version
         except Exception as e:
             print(f'get_github_release_version api error: {e}')
 
         try:
-            resp = requests.get(
+            resp = _github_session.get(
                 html_latest_url,
-                headers={'User-Agent': 'CLIProxyPanel'},
                 timeout=10,
                 allow_redirects=False,
             )
             location = resp.headers.get('Location', '')
             match = re.search(r'/tag/(v[^/?#]+)', location)
             if not match:
-                resp2 = requests.get(
+                resp2 = _github_session.get(
                     html_latest_url,
-                    headers={'User-Agent': 'CLIProxyPanel'},
                     timeout=10,
                     allow_redirects=True,
                 )
@@ -2110,6 +2676,50 @@ def _is_git_repo(path):
         return False
 
 
+_GIT_SHA_RE = re.compile(r'[0-9a-f]{40}|[0-9a-f]{64}')
+
+
+def _read_git_ref(repo_dir, ref='HEAD'):
+    """直接读取 .git 中的引用（支持 ref: 间接引用与 packed-refs），返回完整 commit hash；无法解析时返回 None"""
+    git_dir = os.path.join(repo_dir, '.git')
+    if not os.path.isdir(git_dir):
+        return None
+    for _ in range(5):
+        try:
+            with open(os.path.join(git_dir, ref), 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+        except OSError:
+            content = None
+        if content is None:
+            # 松散引用不存在时查找 packed-refs
+            try:
+                with open(os.path.join(git_dir, 'packed-refs'), 'r', encoding='utf-8') as f:
+                    for line in f:
+                        parts = line.split()
+                        if len(parts) == 2 and parts[1] == ref and _GIT_SHA_RE.fullmatch(parts[0]):
+                            return parts[0]
+            except OSError:
+                pass
+            return None
+        if content.startswith('ref:'):
+            ref = content[4:].strip()
+            continue
+        return content if _GIT_SHA_RE.fullmatch(content) else None
+    return None
+
+
+def _short_git_ref(repo_dir, ref='HEAD'):
+    """读取引用的短 hash，无法直接读取时回退到 git rev-parse"""
+    sha = _read_git_ref(repo_dir, ref)
+    if sha:
+        return sha[:7]
+    if not command_available('git'):
+        return ''
+    rev = 'origin/main' if ref == 'refs/remotes/origin/main' else ref
+    _, stdout, _ = run_cmd(['git', 'rev-parse', '--short', rev], cwd=repo_dir, timeout=10)
+    return stdout
+
+
 def _is_semver_like(version):
     normalized = _normalize_release_version(version)
     if not normalized or normalized in {'unknown', 'dev'}:
@@ -2117,13 +2727,42 @@ def _is_semver_like(version):
     return bool(re.match(r'^\d+(\.\d+){1,3}$', str(normalized)))
 
 
-def _get_last_successful_release_version_from_history():
+_update_history_cache = {'key': None, 'data': []}
+
+
+def _fill_update_history_epochs(history):
+    """旧记录只有 'time' 字符串（UTC），加载时补充 epoch，避免每次请求 strptime"""
+    for entry in history:
+        if not isinstance(entry, dict) or 'epoch' in entry:
+            continue
+        try:
+            update_time = datetime.strptime(entry['time'], '%Y-%m-%d %H:%M:%S')
+            entry['epoch'] = int(update_time.replace(tzinfo=timezone.utc).timestamp())
+        except Exception:
+            entry['epoch'] = None
+
+
+def _load_update_history():
+    """读取更新历史（按文件 mtime/size 缓存，返回值为共享列表，调用方不可修改）"""
+    path = UPDATE_HISTORY_PATH
     try:
-        path = UPDATE_HISTORY_PATH
-        if not path or not os.path.exists(path):
-            return None
+        st = os.stat(path)
+    except OSError:
+        return []
+    cache_key = (st.st_mtime_ns, st.st_size)
+    if _update_history_cache['key'] != cache_key:
         with open(path, 'r', encoding='utf-8') as f:
             history = json.load(f)
+        if isinstance(history, list):
+            _fill_update_history_epochs(history)
+        _update_history_cache['data'] = history
+        _update_history_cache['key'] = cache_key
+    return _update_history_cache['data']
+
+
+def _get_last_successful_release_version_from_history():
+    try:
+        history = _load_update_history()
         if not isinstance(history, list):
             return None
         for entry in reversed(history):
@@ -2185,22 +2824,21 @@ def get_local_version():
                     decorated = _decorate_version_tag(version)
                     cache.set(cache_key, decorated)
                     return decorated
-        except:
+        except (OSError, ValueError):
             pass
 
     cliproxy_dir = CONFIG['cliproxy_dir']
     if _is_git_repo(cliproxy_dir) and command_available('git'):
-        run_cmd(['git', 'fetch', '--tags'], cwd=cliproxy_dir, timeout=10)
-
+        # 只读取本地 tag，perform_update 更新前会先执行 git fetch --tags
         _, stdout, _ = run_cmd(['git', 'describe', '--tags', '--abbrev=0'], cwd=cliproxy_dir, timeout=10)
         if stdout and _is_semver_like(stdout):
             decorated = _decorate_version_tag(stdout)
             cache.set(cache_key, decorated)
             return decorated
 
-        _, stdout, _ = run_cmd(['git', 'rev-parse', '--short', 'HEAD'], cwd=cliproxy_dir, timeout=10)
-        if stdout:
-            management_candidate = management_candidate or stdout
+        head_commit = _short_git_ref(cliproxy_dir)
+        if head_commit:
+            management_candidate = management_candidate or head_commit
 
     history_version = _get_last_successful_release_version_from_history()
     if history_version:
@@ -2221,11 +2859,12 @@ def _reset_log_stats_state():
             'offset': 0,
             'last_size': 0,
             'last_mtime': None,
+            'last_inode': None,
             'total': 0,
             'success': 0,
             'failed': 0,
             'last_time': None,
-            'buffer': '',
+            'buffer': bytearray(),
             'base_total': 0,
             'base_success': 0,
             'base_failed': 0,
@@ -2234,7 +2873,7 @@ def _reset_log_stats_state():
     save_log_stats_state(force=True)
 
 
-def read_log_tail(log_file, max_lines=100, chunk_size=4096):
+def read_log_tail(log_file, max_lines=100, chunk_size=LOG_READ_CHUNK_SIZE):
     """尾部读取日志，避免全量读取"""
     if not os.path.exists(log_file):
         return []
@@ -2246,18 +2885,75 @@ def read_log_tail(log_file, max_lines=100, chunk_size=4096):
             f.seek(0, os.SEEK_END)
             file_size = f.tell()
             remaining = file_size
-            data = b''
-            while remaining > 0 and data.count(b'\n') <= max_lines:
+            # 从尾部倒序按块读取，最后一次性拼接，避免反复前插拷贝
+            parts = []
+            seen_newlines = 0
+            while remaining > 0 and seen_newlines <= max_lines:
                 read_size = chunk_size if remaining >= chunk_size else remaining
                 remaining -= read_size
                 f.seek(remaining)
-                data = f.read(read_size) + data
-            text = data.decode('utf-8', errors='ignore')
+                block = f.read(read_size)
+                parts.append(block)
+                seen_newlines += block.count(b'\n')
+            parts.reverse()
+            text = b''.join(parts).decode('utf-8', errors='ignore')
             return text.splitlines()[-max_lines:]
     except Exception:
         return []
 
 
+def _tally_request_lines(buffer, end):
+    """统计 buffer[:end] 中的访问日志行，返回 (total, success, failed, last_time)"""
+    total = success = failed = 0
+    last_time = None
+    last_hit_line = None
+    # 整块先做一次字面量扫描，没有访问日志时跳过逐行切分
+    if buffer.find(GIN_LOG_MARKER, 0, end) < 0:
+        return total, success, failed, last_time
+    for line in buffer[:end].split(b'\n'):
+        marker_pos = line.find(GIN_LOG_MARKER)
+        if marker_pos < 0 or not (b'POST' in line or b'GET' in line):
+            continue
+        if EXCLUDED_LOG_RE is not None and EXCLUDED_LOG_RE.search(line):
+            continue
+        total += 1
+        last_hit_line = line
+
+        # 状态码紧跟在 [gin_logger.go:NN] 之后
+        code = None
+        close_pos = line.find(b']', marker_pos)
+        if close_pos >= 0:
+            head = line[close_pos + 1:close_pos + 16].split(None, 1)
+            if len(head) == 2 and len(head[0]) == 3 and head[0].isdigit():
+                code = int(head[0])
+        if code is None:
+            status_match = _GIN_STATUS_RE.search(line)
+            if status_match:
+                code = int(status_match.group(1))
+        if code is not None:
+            if 200 <= code < 300:
+                success += 1
+            elif code >= 400:
+                failed += 1
+
+    # 只需要最后一条请求的时间，循环结束后解析一次即可；时间戳固定在行首，锚定匹配
+    if last_hit_line is not None:
+        match = _GIN_TS_RE.match(last_hit_line)
+        if match:
+            last_time = match.group(1).decode('ascii')
+    return total, success, failed, last_time
+
+
+def _log_stats_result(log_state):
+    """由日志统计状态计算对外返回的累计结果（调用方需持有 log_stats_lock）"""
+    return {
+        'count': log_state['base_total'] + log_state['total'],
+        'last_time': log_state.get('last_time'),
+        'success': log_state['base_success'] + log_state['success'],
+        'failed': log_state['base_failed'] + log_state['failed']
+    }
+
+
 def get_request_count_from_logs():
     """从日志获取请求统计（增量解析）"""
     cache_key = 'request_count_logs'
@@ -2273,10 +2969,10 @@ def get_request_count_from_logs():
         with log_stats_lock:
             log_state = state.get('log_stats', {})
             result = {
-                'count': _safe_int(log_state.get('base_total', 0)),
+                'count': log_state['base_total'],
                 'last_time': log_state.get('last_time'),
-                'success': _safe_int(log_state.get('base_success', 0)),
-                'failed': _safe_int(log_state.get('base_failed', 0))
+                'success': log_state['base_success'],
+                'failed': log_state['base_failed']
             }
         cache.set(cache_key, result)
         return result
@@ -2285,18 +2981,40 @@ def get_request_count_from_logs():
         stat = os.stat(log_file)
         file_size = stat.st_size
         mtime = stat.st_mtime
+        inode = stat.st_ino
     except Exception:
         result = {'count': 0, 'last_time': None, 'success': 0, 'failed': 0}
         cache.set(cache_key, result)
         return result
 
-    needs_save = False
+    # 文件大小、mtime、inode 均未变化时无需打开文件，直接返回当前统计
     with log_stats_lock:
         log_state = state.get('log_stats', {})
-        initialized = log_state.get('initialized')
-        last_size = log_state.get('last_size', 0)
-        last_mtime = log_state.get('last_mtime')
-        offset = log_state.get('offset', 0)
+        if (
+            log_state.get('initialized')
+            and log_state.get('last_size') == file_size
+            and log_state.get('last_mtime') == mtime
+            and log_state.get('last_inode') in (None, inode)
+        ):
+            result = _log_stats_result(log_state)
+            cache.set(cache_key, result)
+            return result
+
+    # 同一时间只允许一个线程扫描日志；其他线程直接返回当前统计，不等待磁盘 I/O
+    if not log_scan_lock.acquire(blocking=False):
+        with log_stats_lock:
+            return _log_stats_result(state.get('log_stats', {}))
+
+    try:
+        # 短临界区：只读取增量解析所需的状态快照
+        with log_stats_lock:
+            log_state = state.get('log_stats', {})
+            initialized = log_state.get('initialized')
+            last_size = log_state.get('last_size', 0)
+            last_mtime = log_state.get('last_mtime')
+            last_inode = log_state.get('last_inode')
+            offset = log_state.get('offset', 0)
+            buffer = log_state.get('buffer') or b''
 
         rotated = False
         if not initialized:
@@ -2305,85 +3023,96 @@ def get_request_count_from_logs():
             rotated = True
         elif last_mtime and mtime < last_mtime:
             rotated = True
-
+        elif last_inode is not None and inode != last_inode:
+            rotated = True
         if rotated:
-            if log_state.get('initialized'):
-                log_state['base_total'] = _safe_int(log_state.get('base_total', 0)) + _safe_int(log_state.get('total', 0))
-                log_state['base_success'] = _safe_int(log_state.get('base_success', 0)) + _safe_int(log_state.get('success', 0))
-                log_state['base_failed'] = _safe_int(log_state.get('base_failed', 0)) + _safe_int(log_state.get('failed', 0))
             offset = 0
-            log_state['buffer'] = ''
-            log_state['total'] = 0
-            log_state['success'] = 0
-            log_state['failed'] = 0
-            log_state['last_time'] = None
-        changed = rotated
+            buffer = b''
 
+        # 锁外二进制按块读取增量部分并逐块统计完整的行，未完整的行留在 buffer 中等待下次拼接
+        buffer = bytearray(buffer)
+        new_total = new_success = new_failed = 0
+        new_last_time = None
         try:
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+            with open(log_file, 'rb') as f:
                 if offset:
                     f.seek(offset)
-                new_data = f.read()
+                while True:
+                    chunk = f.read(LOG_READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    buffer += chunk
+                    chunk_nl = chunk.rfind(b'\n')
+                    if chunk_nl < 0:
+                        continue
+                    last_nl = len(buffer) - len(chunk) + chunk_nl
+                    total, success, failed, last_time = _tally_request_lines(buffer, last_nl)
+                    del buffer[:last_nl + 1]
+                    new_total += total
+                    new_success += success
+                    new_failed += failed
+                    if last_time:
+                        new_last_time = last_time
                 new_offset = f.tell()
         except Exception:
             result = {'count': 0, 'last_time': None, 'success': 0, 'failed': 0}
             cache.set(cache_key, result)
             return result
 
-        buffer = log_state.get('buffer', '') + new_data
-        lines = buffer.splitlines(keepends=True)
-        if lines and not lines[-1].endswith('\n'):
-            log_state['buffer'] = lines[-1]
-            lines = lines[:-1]
-        else:
-            log_state['buffer'] = ''
-
-        for line in lines:
-            if '[gin_logger.go' in line and ('POST' in line or 'GET' in line):
-                if any(path in line for path in EXCLUDED_LOG_PATHS):
-                    continue
-                log_state['total'] += 1
-                match = re.search(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]', line)
-                if match:
-                    log_state['last_time'] = match.group(1)
-                status_match = re.search(r'\s(\d{3})\s', line)
-                if status_match:
-                    code = int(status_match.group(1))
-                    if 200 <= code < 300:
-                        log_state['success'] += 1
-                    elif code >= 400:
-                        log_state['failed'] += 1
+        # 短临界区：合并增量结果
+        with log_stats_lock:
+            if state.get('log_stats') is not log_state:
+                # 扫描期间统计被重置或重新加载，丢弃本次结果
+                return _log_stats_result(state.get('log_stats', {}))
+
+            if rotated:
+                if log_state.get('initialized'):
+                    log_state['base_total'] += log_state['total']
+                    log_state['base_success'] += log_state['success']
+                    log_state['base_failed'] += log_state['failed']
+                log_state['total'] = 0
+                log_state['success'] = 0
+                log_state['failed'] = 0
+                log_state['last_time'] = None
+            changed = rotated
+
+            log_state['buffer'] = buffer
+            if new_total:
+                log_state['total'] += new_total
+                log_state['success'] += new_success
+                log_state['failed'] += new_failed
                 changed = True
+            if new_last_time:
+                log_state['last_time'] = new_last_time
 
-        log_state['initialized'] = True
-        log_state['offset'] = new_offset
-        log_state['last_size'] = file_size
-        log_state['last_mtime'] = mtime
-        state['log_stats'] = log_state
-
-        needs_save = changed
+            log_state['initialized'] = True
+            log_state['offset'] = new_offset
+            log_state['last_size'] = file_size
+            log_state['last_mtime'] = mtime
+            log_state['last_inode'] = inode
 
-        result = {
-            'count': _safe_int(log_state.get('base_total', 0)) + _safe_int(log_state.get('total', 0)),
-            'last_time': log_state['last_time'],
-            'success': _safe_int(log_state.get('base_success', 0)) + _safe_int(log_state.get('success', 0)),
-            'failed': _safe_int(log_state.get('base_failed', 0)) + _safe_int(log_state.get('failed', 0))
-        }
+            needs_save = changed
+            result = _log_stats_result(log_state)
         cache.set(cache_key, result)
+    finally:
+        log_scan_lock.release()
 
     if needs_save:
-        save_log_stats_state()
+        request_log_stats_save()
     log_stats_path = CONFIG.get('log_stats_path')
     if log_stats_path and not os.path.exists(log_stats_path):
         save_log_stats_state(force=True)
     return result
 
 
+_VERSION_DIGITS_RE = re.compile(r'[0-9]+')
+
+
 def resolve_version_label(version):
     if not version:
         return version
     version_str = str(version).strip()
-    if not HASH_VERSION_PATTERN.match(version_str):
+    if not HASH_VERSION_PATTERN.fullmatch(version_str):
         return version_str
     if not command_available('git'):
         return version_str
@@ -2397,9 +3126,7 @@ def resolve_version_label(version):
     if not tags:
         return version_str
     def parse_version_key(tag):
-        cleaned = tag.lstrip('vV')
-        parts = re.split(r'[^0-9]+', cleaned)
-        nums = [int(p) for p in parts if p.isdigit()]
+        nums = [int(p) for p in _VERSION_DIGITS_RE.findall(tag.lstrip('vV'))]
         return nums or [0]
     tags.sort(key=parse_version_key)
     return tags[-1]
@@ -2411,15 +3138,11 @@ def get_current_commit():
     cached = cache.get(cache_key, max_age=30)
     if cached:
         return cached
-    if not command_available('git'):
-        cache.set(cache_key, 'unknown')
-        return 'unknown'
     cliproxy_dir = CONFIG['cliproxy_dir']
     if not os.path.isdir(os.path.join(cliproxy_dir, '.git')):
         cache.set(cache_key, 'unknown')
         return 'unknown'
-    _, stdout, _ = run_cmd(['git', 'rev-parse', '--short', 'HEAD'], cwd=cliproxy_dir, timeout=10)
-    result = stdout if stdout else 'unknown'
+    result = _short_git_ref(cliproxy_dir) or 'unknown'
     cache.set(cache_key, result)
     return result
 
@@ -2437,11 +3160,13 @@ def get_latest_commit():
         cache.set(cache_key, 'unknown')
         return 'unknown'
     run_cmd(['git', 'fetch', 'origin', 'main', '--quiet'], cwd=cliproxy_dir, timeout=10)
-    _, stdout, _ = run_cmd(['git', 'rev-parse', '--short', 'origin/main'], cwd=cliproxy_dir, timeout=10)
-    result = stdout if stdout else 'unknown'
+    result = _short_git_ref(cliproxy_dir, 'refs/remotes/origin/main') or 'unknown'
     cache.set(cache_key, result)
     return result
 
+_update_check_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='update-check')
+
+
 def check_for_updates(use_cache=True):
     """检查更新（使用GitHub releases）"""
     cache_key = 'update_check'
@@ -2450,8 +3175,11 @@ def check_for_updates(use_cache=True):
         if cached is not None:
             return cached
 
-    current = get_local_version()
-    latest = get_github_release_version()
+    # 本地版本与 GitHub 最新版本互不依赖，并发获取
+    current_future = _update_check_executor.submit(get_local_version)
+    latest_future = _update_check_executor.submit(get_github_release_version)
+    current = current_future.result()
+    latest = latest_future.result()
     state['current_version'] = _decorate_version_tag(current)
     state['latest_version'] = _decorate_version_tag(latest)
     result = (
@@ -2615,13 +3343,10 @@ def perform_update():
         except Exception as e:
             print(f"Failed to record update history: {e}")
         # 清除版本缓存
-        try:
-            cache.invalidate('local_version')
-            cache.invalidate('management_version')
-            cache.invalidate('github_release')
-            cache.invalidate('update_check')
-        except:
-            pass
+        cache.invalidate('local_version')
+        cache.invalidate('management_version')
+        cache.invalidate('github_release')
+        cache.invalidate('update_check')
 
         return True, result
 
@@ -2632,47 +3357,60 @@ def perform_update():
     finally:
         state['update_in_progress'] = False
 
-def auto_update_worker():
-    while True:
-        interval = max(60, int(CONFIG.get('auto_update_check_interval', 300) or 300))
-        state['next_auto_update_check_time'] = (datetime.now() + timedelta(seconds=interval)).isoformat()
-        time.sleep(interval)
-        state['last_auto_update_check_time'] = datetime.now().isoformat()
+def _auto_update_interval():
+    """下次自动更新检查的间隔（秒），同时记录预计检查时间"""
+    interval = max(60, int(CONFIG.get('auto_update_check_interval', 300) or 300))
+    state['next_auto_update_check_time'] = (datetime.now() + timedelta(seconds=interval)).isoformat()
+    return interval
 
-        if not state['auto_update_enabled']:
-            print(f'[{datetime.now()}] Auto-update skipped: disabled')
-            continue
 
-        if state['update_in_progress']:
-            print(f'[{datetime.now()}] Auto-update skipped: update already in progress')
-            continue
+def auto_update_check():
+    """定时任务：检查更新，系统空闲时在独立线程中执行更新"""
+    state['last_auto_update_check_time'] = datetime.now().isoformat()
 
-        try:
-            has_update = check_for_updates()
-            if not has_update:
-                print(f'[{datetime.now()}] Auto-update check: no new release')
-                continue
+    if not state['auto_update_enabled']:
+        print(f'[{datetime.now()}] Auto-update skipped: disabled')
+        return
+
+    if state['update_in_progress']:
+        print(f'[{datetime.now()}] Auto-update skipped: update already in progress')
+        return
+
+    try:
+        has_update = check_for_updates()
+        if not has_update:
+            print(f'[{datetime.now()}] Auto-update check: no new release')
+            return
+
+        idle_state = get_idle_state()
+        if idle_state.get('is_idle'):
+            print(f'[{datetime.now()}] Update detected and system idle, starting auto-update...')
+            # 更新耗时较长，不占用调度线程
+            threading.Thread(target=perform_update, daemon=True).start()
+        else:
+            print(
+                f'[{datetime.now()}] Auto-update skipped: busy, '
+                f'last request at {idle_state.get("last_request_time")}, '
+                f'threshold={CONFIG["idle_threshold_seconds"]}s'
+            )
+    except Exception as e:
+        print(f'[{datetime.now()}] Auto-update check failed: {e}')
+
+_log_file_cache = {}
 
-            idle_state = get_idle_state()
-            if idle_state.get('is_idle'):
-                print(f'[{datetime.now()}] Update detected and system idle, starting auto-update...')
-                perform_update()
-            else:
-                print(
-                    f'[{datetime.now()}] Auto-update skipped: busy, '
-                    f'last request at {idle_state.get("last_request_time")}, '
-                    f'threshold={CONFIG["idle_threshold_seconds"]}s'
-                )
-        except Exception as e:
-            print(f'[{datetime.now()}] Auto-update check failed: {e}')
 
 def parse_log_file(log_file, max_lines=100):
-    """解析日志文件（优化：Python原生读取，提取实际时间戳）"""
-    if not os.path.exists(log_file):
+    """解析日志文件（优化：Python原生读取，提取实际时间戳；文件未变化时复用结果）"""
+    try:
+        st = os.stat(log_file)
+    except OSError:
         return []
 
-    # 匹配日志时间格式: [2026-01-18 23:48:53]
-    time_pattern = re.compile(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]')
+    cache_key = (log_file, max_lines)
+    file_key = (st.st_size, st.st_mtime_ns, st.st_ino)
+    cached = _log_file_cache.get(cache_key)
+    if cached is not None and cached[0] == file_key:
+        return cached[1]
 
     try:
         lines = read_log_tail(log_file, max_lines=max_lines)
@@ -2681,8 +3419,8 @@ def parse_log_file(log_file, max_lines=100):
         for line in lines:
             line = line.strip()
             if line:
-                # 尝试从日志中提取时间
-                time_match = time_pattern.search(line)
+                # 尝试从行首提取时间，非 '[' 开头的行直接跳过正则
+                time_match = _LOG_TIME_RE.match(line) if line.startswith('[') else None
                 if time_match:
                     # 解析日志中的时间（服务器是UTC）
                     log_time_str = time_match.group(1)
@@ -2690,7 +3428,7 @@ def parse_log_file(log_file, max_lines=100):
                         log_time = datetime.strptime(log_time_str, '%Y-%m-%d %H:%M:%S')
                         # 标记为UTC时间
                         time_iso = log_time.isoformat() + 'Z'
-                    except:
+                    except ValueError:
                         time_iso = datetime.utcnow().isoformat() + 'Z'
                 else:
                     time_iso = datetime.utcnow().isoformat() + 'Z'
@@ -2700,10 +3438,49 @@ def parse_log_file(log_file, max_lines=100):
                     'message': line[:500]
                 })
 
-        return logs[-50:]
-    except:
+        logs = logs[-50:]
+        _log_file_cache[cache_key] = (file_key, logs)
+        return logs
+    except Exception:
         return []
 
+def _is_log_timestamp(text):
+    """判断是否为 'YYYY-MM-DD HH:MM:SS' 格式的时间戳"""
+    return (
+        len(text) == 19
+        and text[4] == '-' and text[7] == '-' and text[10] == ' '
+        and text[13] == ':' and text[16] == ':'
+        and text[:4].isdigit()
+    )
+
+
+def _parse_gin_line(line):
+    """按固定格式扫描 gin 访问日志行，返回与 REQUEST_LOG_PATTERN 相同的分组；格式不符返回 None"""
+    if not line.startswith('[') or line[20:21] != ']':
+        return None
+    timestamp = line[1:20]
+    if not _is_log_timestamp(timestamp):
+        return None
+    marker = line.find('[gin_logger.go:', 21)
+    if marker < 0:
+        return None
+    end = line.find(']', marker)
+    if end < 0:
+        return None
+    fields = line[end + 1:].split('|', 3)
+    if len(fields) != 4:
+        return None
+    status = fields[0].strip()
+    duration = fields[1].strip()
+    client_ip = fields[2].strip()
+    method, _, rest = fields[3].strip().partition(' ')
+    rest = rest.lstrip()
+    path_end = rest.find('"', 1)
+    if not status.isdigit() or not duration or not method or not rest.startswith('"') or path_end <= 1:
+        return None
+    return timestamp, status, duration, client_ip, method, rest[1:path_end]
+
+
 def parse_request_logs(max_lines=200, use_cache=True):
     """解析 CLIProxy 请求日志（优化：预编译正则+缓存+原生读取）"""
     cache_key = 'request_logs'
@@ -2723,11 +3500,16 @@ def parse_request_logs(max_lines=200, use_cache=True):
         lines = read_log_tail(log_file, max_lines=max_lines)
 
         logs = []
-        # 使用预编译的正则表达式
+        # 非访问日志行直接跳过；优先使用手写扫描，格式有偏差时再回退到预编译的正则表达式
         for line in lines:
-            match = REQUEST_LOG_PATTERN.search(line)
-            if match:
-                timestamp, status, duration, client_ip, method, path = match.groups()
+            if '[gin_logger.go:' not in line:
+                continue
+            groups = _parse_gin_line(line)
+            if groups is None:
+                match = REQUEST_LOG_PATTERN.search(line)
+                groups = match.groups() if match else None
+            if groups:
+                timestamp, status, duration, client_ip, method, path = groups
                 client_ip = client_ip.strip()
                 logs.append({
                     'time': timestamp,
@@ -2760,36 +3542,68 @@ def get_paths_info():
         'project_dir': CONFIG['cliproxy_dir']
     }
 
-def load_cliproxy_config(use_cache=True):
-    """加载CLIProxy配置文件（优化：带缓存）"""
-    cache_key = 'cliproxy_config'
-    if use_cache:
-        cached = cache.get(cache_key, max_age=30)
-        if cached:
-            return cached
+_cliproxy_config_cache = {'key': None, 'result': None}
+
+
+_cliproxy_config_bytes_cache = {'key': None, 'data': None}
+
+
+def _invalidate_cliproxy_config_cache():
+    _cliproxy_config_cache['key'] = None
+    _cliproxy_config_cache['result'] = None
+    _cliproxy_config_bytes_cache['key'] = None
+    _cliproxy_config_bytes_cache['data'] = None
+
+
+def _read_cliproxy_config_bytes():
+    """读取配置文件原始字节（按 mtime/size 缓存），文件不存在时返回 None"""
+    config_path = CONFIG['cliproxy_config']
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        return None
+    cache_key = (config_path, st.st_mtime_ns, st.st_size)
+    cached = _cliproxy_config_bytes_cache
+    if cached['key'] == cache_key:
+        return cached['data']
+    with open(config_path, 'rb') as f:
+        data = f.read()
+    cached['data'] = data
+    cached['key'] = cache_key
+    return data
+
 
+def load_cliproxy_config(use_cache=True):
+    """加载CLIProxy配置文件（优化：按文件 mtime/size 缓存解析结果，返回值只读）"""
     config_path = CONFIG['cliproxy_config']
-    if not os.path.exists(config_path):
+    try:
+        st = os.stat(config_path)
+    except OSError:
         return None, 'Config file not found'
 
+    # 文件未变化时直接复用上次解析结果，外部修改可立即生效
+    cache_key = (config_path, st.st_mtime_ns, st.st_size)
+    if use_cache and _cliproxy_config_cache['key'] == cache_key:
+        return _cliproxy_config_cache['result']
+
     if not HAS_YAML:
         # 没有yaml模块时返回原始内容
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
                 result = ({'_raw': f.read()}, None)
-                cache.set(cache_key, result)
-                return result
+        except Exception as e:
+            return None, str(e)
+    else:
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f)
+                result = (config, None)
         except Exception as e:
             return None, str(e)
 
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            result = (config, None)
-            cache.set(cache_key, result)
-            return result
-    except Exception as e:
-        return None, str(e)
+    _cliproxy_config_cache['key'] = cache_key
+    _cliproxy_config_cache['result'] = result
+    return result
 
 def validate_yaml_config(content):
     """验证YAML配置格式"""
@@ -2883,8 +3697,8 @@ def get_system_resources(use_cache=True):
         }
 
         # 尝试获取内存信息（Linux）
-        if is_linux() and command_available('free'):
-            mem_usage = _free_memory_usage()
+        if is_linux():
+            mem_usage = _linux_memory_usage()
             if mem_usage:
                 resources['memory']['total'] = mem_usage['total']
                 resources['memory']['used'] = mem_usage['used']
@@ -2921,25 +3735,14 @@ def get_system_resources(use_cache=True):
         # 网络IO
         net_io = psutil.net_io_counters()
 
-        # 获取更详细的CPU信息
-        cpu_freq = psutil.cpu_freq()
-        cpu_times = psutil.cpu_times_percent(interval=0)
-        per_cpu = psutil.cpu_percent(percpu=True)
-
-        # 获取更详细的内存信息
-        swap = psutil.swap_memory()
-
-        # 获取系统负载（Linux）
-        try:
-            load_avg = psutil.getloadavg()
-        except:
-            load_avg = (0, 0, 0)
-
-        # 获取进程数
-        try:
-            process_count = len(psutil.pids())
-        except:
-            process_count = 0
+        # CPU频率/时间、交换分区、负载、进程数由后台监控线程采样
+        details = resource_monitor.get_system_snapshot() or _sample_system_details()
+        cpu_freq = details['cpu_freq']
+        cpu_times = details['cpu_times']
+        per_cpu = details['per_cpu']
+        swap = details['swap']
+        load_avg = details['load_avg']
+        process_count = details['process_count']
 
         result = {
             'cpu': {
@@ -2993,6 +3796,60 @@ def get_system_resources(use_cache=True):
     except Exception as e:
         return {'error': str(e)}
 
+def _probe_tcp_port(host, port, timeout):
+    """尝试 TCP 连接，返回 (结果码, 耗时毫秒)；0 表示连接成功，地址解析失败时直接抛出"""
+    start = time.monotonic()
+    try:
+        sock = socket.create_connection((host, port), timeout=timeout)
+    except socket.gaierror:
+        raise
+    except OSError as e:
+        return e.errno or -1, (time.monotonic() - start) * 1000
+    latency = (time.monotonic() - start) * 1000
+    sock.close()
+    return 0, latency
+
+
+def _api_port_open():
+    """健康检查用的 API 端口探测：本机地址使用短超时，结果缓存 5 秒"""
+    host, port = _api_host(), _api_port()
+    cache_key = f'api_port_open:{host}:{port}'
+    cached = cache.get(cache_key, max_age=5)
+    if cached is not None:
+        return cached
+    timeout = 0.2 if _is_local_api_host() else 2
+    result, _ = _probe_tcp_port(host, port, timeout)
+    port_open = result == 0
+    cache.set(cache_key, port_open)
+    return port_open
+
+
+HEALTH_CHECK_TIMEOUT_SECONDS = 5
+_health_check_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix='health-check')
+
+
+def _health_disk_percent():
+    if HAS_PSUTIL:
+        try:
+            return psutil.disk_usage('/').percent
+        except Exception:
+            return None
+    if is_linux() and command_available('df'):
+        # 使用df命令获取磁盘信息（Linux）
+        disk_usage = _df_usage(CONFIG.get('disk_path') or '/')
+        if disk_usage:
+            return disk_usage['percent']
+    return None
+
+
+def _add_health_check(results, key, name, status, message, details=None):
+    check = {'name': name, 'status': status, 'message': message}
+    if details is not None:
+        check['details'] = details
+    results['checks'].append(check)
+    results['checks_map'][key] = check
+
+
 def perform_health_check(use_cache=True):
     """执行健康检查（优化：带缓存）"""
     cache_key = 'health_check'
@@ -3001,6 +3858,16 @@ def perform_health_check(use_cache=True):
         if cached:
             return cached
 
+    with health_check_lock:
+        # 等锁期间其他线程可能已完成检查
+        if use_cache:
+            cached = cache.get(cache_key, max_age=10)
+            if cached:
+                return cached
+        return _run_health_checks(cache_key)
+
+
+def _run_health_checks(cache_key):
     results = {
         'timestamp': datetime.now().isoformat(),
         'checks': [],
@@ -3008,177 +3875,95 @@ def perform_health_check(use_cache=True):
         'overall': 'healthy'
     }
 
+    # 可能阻塞在子进程/网络上的检查并发执行，单项超时按 unknown 处理，不拖住整次检查
+    service_future = _health_check_executor.submit(get_service_status)
+    disk_future = _health_check_executor.submit(_health_disk_percent)
+    port_future = _health_check_executor.submit(_api_port_open)
+    deadline = time.monotonic() + HEALTH_CHECK_TIMEOUT_SECONDS
+
+    def wait_result(future):
+        return future.result(timeout=max(0, deadline - time.monotonic()))
+
     # 1. 服务状态检查
-    service = get_service_status()
-    service_check = {
-        'name': '服务状态',
-        'status': 'pass' if service['running'] else 'fail',
-        'message': '服务运行中' if service['running'] else '服务未运行',
-        'details': service
-    }
-    results['checks'].append(service_check)
-    results['checks_map']['service'] = service_check
+    try:
+        service = wait_result(service_future)
+        _add_health_check(
+            results, 'service', '服务状态',
+            'pass' if service['running'] else 'fail',
+            '服务运行中' if service['running'] else '服务未运行',
+            service,
+        )
+    except FuturesTimeoutError:
+        _add_health_check(results, 'service', '服务状态', 'unknown', '服务状态检测超时')
 
     # 2. 配置文件检查
     config, error = load_cliproxy_config()
-    config_check = {
-        'name': '配置文件',
-        'status': 'pass' if config else 'fail',
-        'message': '配置文件有效' if config else f'配置错误: {error}'
-    }
-    results['checks'].append(config_check)
-    results['checks_map']['config'] = config_check
+    _add_health_check(
+        results, 'config', '配置文件',
+        'pass' if config else 'fail',
+        '配置文件有效' if config else f'配置错误: {error}',
+    )
 
     # 3. 磁盘空间检查
-    if HAS_PSUTIL:
-        try:
-            disk = psutil.disk_usage('/')
-            disk_ok = disk.percent < 90
-            disk_check = {
-                'name': '磁盘空间',
-                'status': 'pass' if disk_ok else 'warn',
-                'message': f'已使用 {disk.percent}%',
-                'details': {'percent': disk.percent}
-            }
-            results['checks'].append(disk_check)
-            results['checks_map']['disk'] = disk_check
-        except:
-            disk_check = {
-                'name': '磁盘空间',
-                'status': 'unknown',
-                'message': '无法获取磁盘信息'
-            }
-            results['checks'].append(disk_check)
-            results['checks_map']['disk'] = disk_check
+    try:
+        disk_percent = wait_result(disk_future)
+    except FuturesTimeoutError:
+        disk_percent = None
+    if disk_percent is not None:
+        _add_health_check(
+            results, 'disk', '磁盘空间',
+            'pass' if disk_percent < 90 else 'warn',
+            f'已使用 {disk_percent}%',
+            {'percent': disk_percent},
+        )
     else:
-        # 使用df命令获取磁盘信息（Linux）
-        if is_linux() and command_available('df'):
-            disk_usage = _df_usage(CONFIG.get('disk_path') or '/')
-            if disk_usage:
-                percent = disk_usage['percent']
-                disk_ok = percent < 90
-                disk_check = {
-                    'name': '磁盘空间',
-                    'status': 'pass' if disk_ok else 'warn',
-                    'message': f'已使用 {percent}%',
-                    'details': {'percent': percent}
-                }
-                results['checks'].append(disk_check)
-                results['checks_map']['disk'] = disk_check
-            else:
-                disk_check = {
-                    'name': '磁盘空间',
-                    'status': 'unknown',
-                    'message': '无法获取磁盘信息'
-                }
-                results['checks'].append(disk_check)
-                results['checks_map']['disk'] = disk_check
-        else:
-            disk_check = {
-                'name': '磁盘空间',
-                'status': 'unknown',
-                'message': '无法获取磁盘信息'
-            }
-            results['checks'].append(disk_check)
-            results['checks_map']['disk'] = disk_check
+        _add_health_check(results, 'disk', '磁盘空间', 'unknown', '无法获取磁盘信息')
 
     # 4. 内存检查
+    mem_percent = None
     if HAS_PSUTIL:
         try:
-            memory = psutil.virtual_memory()
-            mem_ok = memory.percent < 90
-            memory_check = {
-                'name': '内存使用',
-                'status': 'pass' if mem_ok else 'warn',
-                'message': f'已使用 {memory.percent}%',
-                'details': {'percent': memory.percent}
-            }
-            results['checks'].append(memory_check)
-            results['checks_map']['memory'] = memory_check
-        except:
-            memory_check = {
-                'name': '内存使用',
-                'status': 'unknown',
-                'message': '无法获取内存信息'
-            }
-            results['checks'].append(memory_check)
-            results['checks_map']['memory'] = memory_check
+            mem_percent = psutil.virtual_memory().percent
+        except Exception:
+            pass
+    elif is_linux():
+        mem_usage = _linux_memory_usage()
+        if mem_usage:
+            mem_percent = mem_usage['percent']
+    if mem_percent is not None:
+        _add_health_check(
+            results, 'memory', '内存使用',
+            'pass' if mem_percent < 90 else 'warn',
+            f'已使用 {mem_percent}%',
+            {'percent': mem_percent},
+        )
     else:
-        # 使用free命令获取内存信息（Linux）
-        if is_linux() and command_available('free'):
-            mem_usage = _free_memory_usage()
-            if mem_usage:
-                percent = mem_usage['percent']
-                mem_ok = percent < 90
-                memory_check = {
-                    'name': '内存使用',
-                    'status': 'pass' if mem_ok else 'warn',
-                    'message': f'已使用 {percent}%',
-                    'details': {'percent': percent}
-                }
-                results['checks'].append(memory_check)
-                results['checks_map']['memory'] = memory_check
-            else:
-                memory_check = {
-                    'name': '内存使用',
-                    'status': 'unknown',
-                    'message': '无法获取内存信息'
-                }
-                results['checks'].append(memory_check)
-                results['checks_map']['memory'] = memory_check
-        else:
-            memory_check = {
-                'name': '内存使用',
-                'status': 'unknown',
-                'message': '无法获取内存信息'
-            }
-            results['checks'].append(memory_check)
-            results['checks_map']['memory'] = memory_check
+        _add_health_check(results, 'memory', '内存使用', 'unknown', '无法获取内存信息')
 
     # 5. 认证文件检查
     auth_dir = CONFIG['auth_dir']
     if os.path.exists(auth_dir):
-        auth_files = [f for f in os.listdir(auth_dir) if os.path.isfile(os.path.join(auth_dir, f))]
-        auth_check = {
-            'name': '认证文件',
-            'status': 'pass' if len(auth_files) > 0 else 'warn',
-            'message': f'找到 {len(auth_files)} 个凭证文件',
-            'details': {'count': len(auth_files)}
-        }
-        results['checks'].append(auth_check)
-        results['checks_map']['auth'] = auth_check
+        with os.scandir(auth_dir) as entries:
+            auth_count = sum(1 for entry in entries if entry.is_file())
+        _add_health_check(
+            results, 'auth', '认证文件',
+            'pass' if auth_count > 0 else 'warn',
+            f'找到 {auth_count} 个凭证文件',
+            {'count': auth_count},
+        )
     else:
-        auth_check = {
-            'name': '认证文件',
-            'status': 'fail',
-            'message': '认证目录不存在'
-        }
-        results['checks'].append(auth_check)
-        results['checks_map']['auth'] = auth_check
+        _add_health_check(results, 'auth', '认证文件', 'fail', '认证目录不存在')
 
     # 6. API端口检查
     try:
-        import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(2)
-        result = sock.connect_ex((_api_host(), _api_port()))
-        sock.close()
-        port_open = result == 0
-        port_check = {
-            'name': 'API端口',
-            'status': 'pass' if port_open else 'fail',
-            'message': f'端口 {_api_host()}:{_api_port()} {"开放" if port_open else "关闭"}'
-        }
-        results['checks'].append(port_check)
-        results['checks_map']['api_port'] = port_check
-    except:
-        port_check = {
-            'name': 'API端口',
-            'status': 'unknown',
-            'message': '无法检测端口状态'
-        }
-        results['checks'].append(port_check)
-        results['checks_map']['api_port'] = port_check
+        port_open = wait_result(port_future)
+        _add_health_check(
+            results, 'api_port', 'API端口',
+            'pass' if port_open else 'fail',
+            f'端口 {_api_host()}:{_api_port()} {"开放" if port_open else "关闭"}',
+        )
+    except (OSError, ValueError, FuturesTimeoutError):
+        _add_health_check(results, 'api_port', 'API端口', 'unknown', '无法检测端口状态')
 
     # 计算整体状态
     statuses = [c['status'] for c in results['checks']]
@@ -3269,7 +4054,7 @@ def sync_usage_state(use_cache=True):
         acc['failure'] = acc.get('failure', 0) + delta_failure
         state['accumulated_stats'] = acc
 
-        state['last_snapshot'] = {
+        new_snapshot = {
             'input_tokens': current_input,
             'output_tokens': current_output,
             'cached_tokens': current_cached,
@@ -3277,6 +4062,9 @@ def sync_usage_state(use_cache=True):
             'success': current_success,
             'failure': current_failure,
         }
+        # 快照不变时累计值也不会变，无需标记持久化
+        snapshot_changed = new_snapshot != last
+        state['last_snapshot'] = new_snapshot
 
         display_input_tokens = acc['input_tokens']
         display_output_tokens = acc['output_tokens']
@@ -3298,14 +4086,14 @@ def sync_usage_state(use_cache=True):
             state['stats']['input_tokens'] = display_input_tokens
             state['stats']['output_tokens'] = display_output_tokens
             state['stats']['cached_tokens'] = display_cached_tokens
-
-        save_persistent_stats()
+            if snapshot_changed:
+                _bump_stats_version()
 
         final_count = display_total_requests if display_total_requests > 0 else log_requests.get('count', 0)
         final_success = display_success if display_success > 0 else log_requests.get('success', 0)
         final_failed = display_failure if display_failure > 0 else log_requests.get('failed', 0)
 
-        return {
+        result = {
             'log_requests': log_requests,
             'pricing': pricing,
             'pricing_meta': pricing_meta,
@@ -3330,6 +4118,10 @@ def sync_usage_state(use_cache=True):
             },
         }
 
+    # 写盘放在 usage_sync_lock 之外，避免阻塞其他同步请求
+    request_persistent_stats_save()
+    return result
+
 # ==================== API 路由 ====================
 
 
@@ -3337,9 +4129,37 @@ def sync_usage_state(use_cache=True):
 def healthz():
     return jsonify({'status': 'ok'})
 
+_index_cache = {'key': None, 'body': None, 'etag': None}
+
+
+def _load_index_html():
+    """读取 static/index.html（按 mtime/size 缓存内容与 ETag）"""
+    path = os.path.join(app.static_folder, 'index.html')
+    st = os.stat(path)
+    cache_key = (st.st_mtime_ns, st.st_size)
+    if _index_cache['key'] != cache_key:
+        with open(path, 'rb') as f:
+            body = f.read()
+        _index_cache['body'] = body
+        _index_cache['etag'] = f'{st.st_mtime_ns:x}-{st.st_size:x}'
+        _index_cache['key'] = cache_key
+    return _index_cache['body'], _index_cache['etag']
+
+
 @app.route('/')
 def index():
-    return send_from_directory('static', 'index.html')
+    try:
+        body, etag = _load_index_html()
+    except OSError:
+        return send_from_directory('static', 'index.html')
+    # 页面内容未变化时直接返回 304
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/api/status')
 def api_status():
@@ -3436,10 +4256,7 @@ def api_clear_cliproxy_logs():
             errors.append(f"{log_file}: {e}")
 
     _reset_log_stats_state()
-    try:
-        cache.invalidate('request_count_logs')
-    except:
-        pass
+    cache.invalidate('request_count_logs')
 
     if errors:
         return jsonify({'success': False, 'message': '清空失败', 'errors': errors}), 500
@@ -3468,26 +4285,19 @@ def api_update_history():
     history_file = UPDATE_HISTORY_PATH
     try:
         os.makedirs(os.path.dirname(history_file), exist_ok=True)
-        if os.path.exists(history_file):
-            with open(history_file, 'r', encoding='utf-8') as f:
-                history = json.load(f)
-        else:
-            history = []
+        # 只处理返回的最近10条，复制后再补充展示字段，不修改缓存
+        recent = [dict(entry) for entry in _load_update_history()[-10:]]
 
         # 计算每次更新距今多少小时
-        now = datetime.utcnow()
-        for entry in history:
-            try:
-                update_time = datetime.strptime(entry['time'], '%Y-%m-%d %H:%M:%S')
-                hours_ago = (now - update_time).total_seconds() / 3600
-                entry['hours_ago'] = round(hours_ago, 1)
-            except:
-                entry['hours_ago'] = None
+        now = time.time()
+        for entry in recent:
+            epoch = entry.get('epoch')
+            entry['hours_ago'] = round((now - epoch) / 3600, 1) if epoch is not None else None
             entry['version'] = resolve_version_label(entry.get('version'))
 
         return jsonify({
             'success': True,
-            'history': history[-10:]  # 返回最近10条
+            'history': recent  # 返回最近10条
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -3497,15 +4307,13 @@ def record_update_history(version, success=True):
     history_file = UPDATE_HISTORY_PATH
     try:
         os.makedirs(os.path.dirname(history_file), exist_ok=True)
-        if os.path.exists(history_file):
-            with open(history_file, 'r', encoding='utf-8') as f:
-                history = json.load(f)
-        else:
-            history = []
+        history = list(_load_update_history())
 
+        now = time.time()
         history.append({
             'version': version,
-            'time': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+            'time': datetime.utcfromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S'),
+            'epoch': int(now),
             'success': success
         })
 
@@ -3515,6 +4323,11 @@ def record_update_history(version, success=True):
         with open(history_file, 'w', encoding='utf-8') as f:
             json.dump(history, f, ensure_ascii=False, indent=2)
 
+        # 直接以写入内容刷新缓存，无需重新读取
+        st = os.stat(history_file)
+        _update_history_cache['key'] = (st.st_mtime_ns, st.st_size)
+        _update_history_cache['data'] = history
+
         return True
     except Exception as e:
         print(f"Error recording update history: {e}")
@@ -3599,6 +4412,7 @@ def api_pricing():
         CONFIG['pricing_input'] = input_price
         CONFIG['pricing_output'] = output_price
         CONFIG['pricing_cache'] = cache_price
+        state['pricing_floats'] = {'input': input_price, 'output': output_price, 'cache': cache_price}
         _update_dotenv_values({
             'pricing_input': input_price,
             'pricing_output': output_price,
@@ -3617,11 +4431,7 @@ def api_pricing():
     effective, pricing_meta = get_effective_pricing()
     return jsonify({
         'success': True,
-        'pricing': {
-            'input': _safe_float(CONFIG.get('pricing_input', 0.0)),
-            'output': _safe_float(CONFIG.get('pricing_output', 0.0)),
-            'cache': _safe_float(CONFIG.get('pricing_cache', 0.0)),
-        },
+        'pricing': dict(_manual_pricing()),
         'effective_pricing': effective,
         'pricing_basis': get_pricing_basis_info(),
         'pricing_meta': pricing_meta,
@@ -3660,7 +4470,7 @@ def api_quote():
                 if not line.endswith('\n'):
                     line = line + '\n'
                 f.write(line)
-            cache.set('quotes_cache', load_quotes())
+            _quotes_cache['key'] = None
             return jsonify({'success': True})
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
@@ -3670,42 +4480,45 @@ def api_quote():
 
 @app.route('/api/record-request', methods=['POST'])
 def api_record_request():
+    # 请求解析与记录构造放在锁外，两把锁依次短暂持有而不嵌套
+    data = request.json or {}
+    model = data.get('model', 'unknown')
+    status = data.get('status', 'unknown')
+    entry = {
+        'time': time.time(),
+        'model': model,
+        'client': request.remote_addr,
+        'status': status,
+        'response_time': data.get('response_time', 0)
+    }
+
     with log_lock:
         state['last_request_time'] = time.time()
         state['request_count'] += 1
+        state['request_log'].append(entry)
 
-        data = request.json or {}
-        state['request_log'].append({
-            'time': datetime.now().isoformat(),
-            'model': data.get('model', 'unknown'),
-            'client': request.remote_addr,
-            'status': data.get('status', 'unknown'),
-            'response_time': data.get('response_time', 0)
-        })
-
-        if len(state['request_log']) > 100:
-            state['request_log'] = state['request_log'][-100:]
-
-        # 更新统计
-        with stats_lock:
-            state['stats']['total_requests'] += 1
-            if data.get('status') == 'success':
-                state['stats']['successful_requests'] += 1
-            else:
-                state['stats']['failed_requests'] += 1
+    # 更新统计
+    with stats_lock:
+        stats = state['stats']
+        stats['total_requests'] += 1
+        if status == 'success':
+            stats['successful_requests'] += 1
+        else:
+            stats['failed_requests'] += 1
 
-            model = data.get('model', 'unknown')
-            state['stats']['model_usage'][model] = state['stats']['model_usage'].get(model, 0) + 1
+        model_usage = stats['model_usage']
+        model_usage[model] = model_usage.get(model, 0) + 1
+        _bump_stats_version()
 
-    # 触发持久化保存（后台线程会定期保存，这里只是触发检查）
-    save_persistent_stats()
+    # 触发持久化保存（后台线程运行时由其定期保存）
+    request_persistent_stats_save()
 
     return jsonify({'success': True})
 
 @app.route('/api/request-history')
 def api_request_history():
     return jsonify({
-        'history': state['request_log'][-50:],
+        'history': _recent_request_log(50),
         'total_count': state['request_count'],
         'last_time': state['last_request_time']
     })
@@ -3740,15 +4553,15 @@ def api_auth_files():
 
     try:
         files = []
-        for f in os.listdir(auth_dir):
-            filepath = os.path.join(auth_dir, f)
-            if os.path.isfile(filepath):
-                stat = os.stat(filepath)
-                files.append({
-                    'name': f,
-                    'size': stat.st_size,
-                    'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
-                })
+        with os.scandir(auth_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append({
+                        'name': entry.name,
+                        'size': stat.st_size,
+                        'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
+                    })
         return jsonify({'files': files, 'path': auth_dir, 'source': 'filesystem'})
     except Exception as e:
         return jsonify({'files': [], 'error': str(e), 'source': 'filesystem'})
@@ -3756,13 +4569,11 @@ def api_auth_files():
 @app.route('/api/config', methods=['GET'])
 def api_get_config():
     config_path = CONFIG['cliproxy_config']
-    if not os.path.exists(config_path):
-        return jsonify({'success': False, 'error': 'Config file not found', 'path': config_path}), 404
-
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return jsonify({'success': True, 'content': content, 'path': config_path})
+        data = _read_cliproxy_config_bytes()
+        if data is None:
+            return jsonify({'success': False, 'error': 'Config file not found', 'path': config_path}), 404
+        return jsonify({'success': True, 'content': data.decode('utf-8'), 'path': config_path})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -3786,11 +4597,10 @@ def api_upload_config():
             file.stream.seek(0)
             backup_path = config_path + '.bak'
             if os.path.exists(config_path):
-                import shutil
                 shutil.copy2(config_path, backup_path)
 
             file.save(config_path)
-            cache.invalidate('cliproxy_config')
+            _invalidate_cliproxy_config_cache()
             return jsonify({
                 'success': True,
                 'message': 'Config uploaded successfully',
@@ -3808,13 +4618,12 @@ def api_upload_config():
                 return jsonify({'success': False, 'error': validation.get('errors', ['Invalid config'])[0]}), 400
             backup_path = config_path + '.bak'
             if os.path.exists(config_path):
-                import shutil
                 shutil.copy2(config_path, backup_path)
 
             with open(config_path, 'w', encoding='utf-8') as f:
                 f.write(data['content'])
 
-            cache.invalidate('cliproxy_config')
+            _invalidate_cliproxy_config_cache()
             return jsonify({
                 'success': True,
                 'message': 'Config saved successfully',
@@ -3838,9 +4647,8 @@ def api_restore_config():
         return jsonify({'success': False, 'error': 'No backup file found'}), 404
 
     try:
-        import shutil
         shutil.copy2(backup_path, config_path)
-        cache.invalidate('cliproxy_config')
+        _invalidate_cliproxy_config_cache()
         return jsonify({
             'success': True,
             'message': 'Config restored from backup',
@@ -3874,7 +4682,7 @@ def api_reload_config():
     if not _is_local_api_host():
         return jsonify({'success': False, 'message': 'Reload only supported for local CLIProxy instances'}), 400
 
-    if not command_available('pgrep'):
+    if not hasattr(signal, 'SIGHUP') or not (os.path.isdir(PROC_DIR) or command_available('pgrep')):
         return jsonify({'success': False, 'message': 'Reload not supported on this platform'}), 400
 
     pid_out = _cliproxy_pid()
@@ -3883,10 +4691,12 @@ def api_reload_config():
         return jsonify({'success': False, 'message': '服务未运行'}), 400
 
     try:
-        if command_available('kill'):
-            success, stdout, stderr = run_cmd(['kill', '-HUP', pid_out])
-        else:
-            success, stdout, stderr = (False, '', 'kill not available')
+        # 直接发送 SIGHUP，无需启动 kill 子进程
+        try:
+            os.kill(int(pid_out), signal.SIGHUP)
+            success = True
+        except (OSError, ValueError):
+            success = False
 
         if success:
             return jsonify({'success': True, 'message': '配置重载信号已发送'})
@@ -3950,6 +4760,9 @@ def api_set_routing():
     if not config:
         return jsonify({'success': False, 'error': error}), 500
 
+    # 缓存中的配置为共享对象，修改前先深拷贝
+    config = copy.deepcopy(config)
+
     # 更新路由策略
     if 'routing' not in config:
         config['routing'] = {}
@@ -3957,7 +4770,6 @@ def api_set_routing():
 
     try:
         # 备份
-        import shutil
         backup_path = config_path + '.bak'
         if os.path.exists(config_path):
             shutil.copy2(config_path, backup_path)
@@ -3966,7 +4778,7 @@ def api_set_routing():
         with open(config_path, 'w', encoding='utf-8') as f:
             yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
 
-        cache.invalidate('cliproxy_config')
+        _invalidate_cliproxy_config_cache()
         return jsonify({'success': True, 'message': f'路由策略已设置为 {strategy}'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -3987,16 +4799,27 @@ def api_resources():
 @app.route('/api/stats')
 def api_stats():
     """获取统计数据"""
+    # 锁内只做计数读取和浅拷贝，派生值在锁外计算
     with stats_lock:
-        stats = {
-            'total_requests': state['stats']['total_requests'],
-            'successful_requests': state['stats']['successful_requests'],
-            'failed_requests': state['stats']['failed_requests'],
-            'success_rate': (state['stats']['successful_requests'] / max(state['stats']['total_requests'], 1)) * 100,
-            'model_usage': dict(state['stats']['model_usage']),
-            'error_types': dict(state['stats']['error_types']),
-            'request_log': state['request_log'][-20:],
-        }
+        current = state['stats']
+        total = current['total_requests']
+        successful = current['successful_requests']
+        failed = current['failed_requests']
+        model_usage = current['model_usage'].copy()
+        error_types = current['error_types'].copy()
+    # request_log 由 log_lock 保护
+    with log_lock:
+        request_log = _recent_request_log(20)
+
+    stats = {
+        'total_requests': total,
+        'successful_requests': successful,
+        'failed_requests': failed,
+        'success_rate': (successful / max(total, 1)) * 100,
+        'model_usage': model_usage,
+        'error_types': error_types,
+        'request_log': request_log,
+    }
 
     return jsonify(stats)
 
@@ -4038,6 +4861,7 @@ def api_clear_stats():
         state['stats']['error_types'].clear()
         state['request_log'].clear()
         state['request_count'] = 0
+        _bump_stats_version()
 
     # 保存清空后的状态到持久化文件
     save_persistent_stats(force=True)
@@ -4062,7 +4886,6 @@ def api_clear_stats():
         if os.path.exists(log_file):
             # 备份并清空日志
             backup_file = log_file + '.bak'
-            import shutil
             shutil.copy2(log_file, backup_file)
             # 清空日志文件
             with open(log_file, 'w', encoding='utf-8') as f:
@@ -4085,7 +4908,7 @@ def api_models():
         headers['Authorization'] = f'Bearer {api_key}'
 
     try:
-        resp = requests.get(models_url, headers=headers, timeout=10)
+        resp = _management_session.get(models_url, headers=headers, timeout=10)
         resp.raise_for_status()
         payload = resp.json()
         models = payload.get('data', []) if isinstance(payload, dict) else []
@@ -4106,13 +4929,7 @@ def api_test_connection():
     if target in ['api', 'all']:
         # 测试API端口
         try:
-            import socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            start = time.time()
-            result = sock.connect_ex((_api_host(), _api_port()))
-            latency = (time.time() - start) * 1000
-            sock.close()
+            result, latency = _probe_tcp_port(_api_host(), _api_port(), 5)
 
             results['tests'].append({
                 'name': 'API端口',
@@ -4130,13 +4947,7 @@ def api_test_connection():
     if target in ['internet', 'all']:
         # 测试外网连接
         try:
-            import socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            start = time.time()
-            result = sock.connect_ex(('8.8.8.8', 53))
-            latency = (time.time() - start) * 1000
-            sock.close()
+            result, latency = _probe_tcp_port('8.8.8.8', 53, 2)
 
             results['tests'].append({
                 'name': '外网连接',
@@ -4156,6 +4967,9 @@ def api_test_connection():
 
     return jsonify(results)
 
+API_TEST_MAX_BODY_BYTES = 2 * 1024 * 1024
+
+
 @app.route('/api/test/api', methods=['POST'])
 def api_test_api():
     """API测试器"""
@@ -4180,120 +4994,125 @@ def api_test_api():
     base_url = _build_management_base_url()
     url = base_url + endpoint
 
-    try:
-        import urllib.request
-        import urllib.error
+    request_headers = {str(key): str(value) for key, value in headers.items()}
+    if body:
+        request_headers['Content-Type'] = 'application/json'
+    req_data = json.dumps(body).encode() if body else None
 
+    try:
         start_time = time.time()
-
-        req_data = json.dumps(body).encode() if body else None
-        req = urllib.request.Request(url, data=req_data, method=method)
-
-        for key, value in headers.items():
-            req.add_header(key, value)
-
-        if body:
-            req.add_header('Content-Type', 'application/json')
-
+        # 复用与管理接口相同的 keep-alive 连接池
         try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                response_time = (time.time() - start_time) * 1000
-                response_body = response.read().decode('utf-8')
-
-                try:
-                    response_json = json.loads(response_body)
-                except:
-                    response_json = None
-
-                return jsonify({
-                    'success': True,
-                    'status': response.status,
-                    'response_time': f'{response_time:.1f}ms',
-                    'headers': dict(response.headers),
-                    'body': response_json if response_json else response_body[:2000]
-                })
-        except urllib.error.HTTPError as e:
-            response_time = (time.time() - start_time) * 1000
+            # stream=True 按上限读取响应体，避免异常的大响应占满内存
+            response = _management_session.request(method, url, data=req_data, headers=request_headers, timeout=30, stream=True)
+            is_error = response.status_code >= 400
+            content = _read_response_limited(response, 1000 if is_error else API_TEST_MAX_BODY_BYTES)
+        except requests.RequestException as e:
             return jsonify({
                 'success': False,
-                'status': e.code,
-                'response_time': f'{response_time:.1f}ms',
-                'error': str(e),
-                'body': e.read().decode('utf-8')[:1000] if e.fp else None
+                'error': f'连接失败: {str(e)}'
             })
-        except urllib.error.URLError as e:
+        response_time = (time.time() - start_time) * 1000
+
+        if is_error:
             return jsonify({
                 'success': False,
-                'error': f'连接失败: {str(e.reason)}'
+                'status': response.status_code,
+                'response_time': f'{response_time:.1f}ms',
+                'error': f'HTTP Error {response.status_code}: {response.reason}',
+                'body': content.decode('utf-8', errors='replace')
             })
+
+        try:
+            response_json = _json_loads(content)
+        except ValueError:
+            response_json = None
+
+        return jsonify({
+            'success': True,
+            'status': response.status_code,
+            'response_time': f'{response_time:.1f}ms',
+            'headers': dict(response.headers),
+            'body': response_json if response_json else content.decode('utf-8', errors='replace')[:2000]
+        })
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         })
 
+def _export_attachment_headers(prefix, ext):
+    """导出文件下载头，文件名带本地时间戳"""
+    return {'Content-Disposition': f'attachment; filename={prefix}_{time.strftime("%Y%m%d_%H%M%S")}.{ext}'}
+
+
 @app.route('/api/export/<data_type>')
 def api_export(data_type):
-    """数据导出"""
+    """数据导出（默认紧凑 JSON，?pretty=1 时缩进输出）"""
+    pretty = _parse_bool(request.args.get('pretty'))
     if data_type == 'logs':
-        logs = state['request_log']
-        content = json.dumps(logs, indent=2, ensure_ascii=False)
+        # request_log 最多 REQUEST_LOG_LIMIT 条，锁内取快照后一次性编码即可
+        with log_lock:
+            logs = _recent_request_log(REQUEST_LOG_LIMIT)
+        content = _json_dumps_bytes(logs, indent=pretty)
         return Response(
             content,
             mimetype='application/json',
-            headers={'Content-Disposition': f'attachment; filename=logs_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'}
+            headers=_export_attachment_headers('logs', 'json')
         )
 
     elif data_type == 'stats':
+        # 锁内只复制计数（model_usage 的值为整数，浅拷贝即可），时间格式化与序列化在锁外完成
         with stats_lock:
-            stats = {
-                'exported_at': datetime.now().isoformat(),
-                'total_requests': state['stats']['total_requests'],
-                'successful_requests': state['stats']['successful_requests'],
-                'failed_requests': state['stats']['failed_requests'],
-                'model_usage': dict(state['stats']['model_usage']),
-            }
-        content = json.dumps(stats, indent=2, ensure_ascii=False)
+            current = state['stats']
+            total = current['total_requests']
+            successful = current['successful_requests']
+            failed = current['failed_requests']
+            model_usage = dict(current['model_usage'])
+        stats = {
+            'exported_at': datetime.now().isoformat(),
+            'total_requests': total,
+            'successful_requests': successful,
+            'failed_requests': failed,
+            'model_usage': model_usage,
+        }
+        content = _json_dumps_bytes(stats, indent=pretty)
         return Response(
             content,
             mimetype='application/json',
-            headers={'Content-Disposition': f'attachment; filename=stats_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'}
+            headers=_export_attachment_headers('stats', 'json')
         )
 
     elif data_type == 'config':
-        config_path = CONFIG['cliproxy_config']
-        if os.path.exists(config_path):
-            with open(config_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+        content = _read_cliproxy_config_bytes()
+        if content is not None:
             return Response(
                 content,
                 mimetype='application/x-yaml',
-                headers={'Content-Disposition': f'attachment; filename=config_{datetime.now().strftime("%Y%m%d_%H%M%S")}.yaml'}
+                headers=_export_attachment_headers('config', 'yaml')
             )
         return jsonify({'error': 'Config not found'}), 404
 
     elif data_type == 'health':
         health = perform_health_check()
-        content = json.dumps(health, indent=2, ensure_ascii=False)
+        content = _json_dumps_bytes(health, indent=pretty)
         return Response(
             content,
             mimetype='application/json',
-            headers={'Content-Disposition': f'attachment; filename=health_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'}
+            headers=_export_attachment_headers('health', 'json')
         )
 
     return jsonify({'error': 'Unknown data type'}), 400
 
-# 启动后台任务
+# 后台定时任务
 def background_tasks():
-    """后台任务：定期健康检查和资源监控"""
-    while True:
-        try:
-            perform_health_check()
-            get_request_count_from_logs()
-            sync_usage_state(use_cache=False)
-        except Exception as e:
-            print(f'[{datetime.now()}] Health check failed: {e}')
-        time.sleep(60)
+    """定时任务：健康检查、日志统计与 usage 同步（每60秒）"""
+    try:
+        perform_health_check()
+        get_request_count_from_logs()
+        sync_usage_state(use_cache=False)
+    except Exception as e:
+        print(f'[{datetime.now()}] Health check failed: {e}')
 
 if __name__ == '__main__':
     from waitress import serve
@@ -4318,25 +5137,27 @@ if __name__ == '__main__':
     # 启动资源监控器（非阻塞CPU监控）
     resource_monitor.start()
 
-    # 启动自动更新线程
-    auto_thread = threading.Thread(target=auto_update_worker, daemon=True)
-    auto_thread.start()
-
-    # 启动后台任务线程
-    bg_thread = threading.Thread(target=background_tasks, daemon=True)
-    bg_thread.start()
-
-    # 启动 usage 持久化线程
+    # 注册定时任务，统一由一个调度线程执行
+    # usage 快照导入
     start_usage_snapshot_worker()
-
-    # 启动统计数据持久化线程
+    # 健康检查与统计同步
+    background_scheduler.add('background_tasks', 60, background_tasks)
+    # 自动更新检查
+    background_scheduler.add('auto_update', _auto_update_interval, auto_update_check, delay=_auto_update_interval())
+    # 统计数据持久化
     start_persistent_stats_worker()
+    background_scheduler.start()
+    # systemd 停止/重启时立即退出并保存统计，而不是丢失最近一个保存周期的数据
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, _handle_shutdown_signal)
+
+    # 启动日志统计保存线程
+    start_log_stats_saver()
 
     # 预加载语录并做数量检查
-    quotes = load_quotes()
+    quotes = get_quotes()
     if quotes:
-        cache.set('quotes_cache', quotes)
-        author_count = len({q.get('author') for q in quotes if q.get('author')})
+        author_count = len(get_quote_authors())
         if len(quotes) < 300 or author_count < 30:
             print(f"Warning: quotes count {len(quotes)}, authors {author_count}")
 
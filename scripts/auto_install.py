@@ -28,7 +28,18 @@ def venv_python(venv_dir: Path, is_windows: bool):
 
 
 def install_requirements(project_root: Path, venv_py: str):
-    run([venv_py, "-m", "pip", "install", "-r", "requirements.txt"], cwd=str(project_root))
+    uv = shutil.which("uv")
+    if uv:
+        run([uv, "pip", "install", "--python", venv_py, "-r", "requirements.txt"], cwd=str(project_root))
+        return
+    run(
+        [
+            venv_py, "-m", "pip", "install",
+            "--prefer-binary", "--no-compile", "--disable-pip-version-check",
+            "-r", "requirements.txt",
+        ],
+        cwd=str(project_root),
+    )
 
 
 def ensure_env(project_root: Path, venv_py: str):
@@ -76,24 +87,22 @@ def systemd_quote(value: Path | str):
 
 def install_systemd(project_root: Path, venv_py: str, service_name: str, start_service: bool):
     service_path = Path("/etc/systemd/system") / f"{service_name}.service"
-    content = "\n".join([
-        "[Unit]",
-        "Description=CLIProxy Management Panel",
-        "After=network.target",
-        "",
-        "[Service]",
-        "Type=simple",
-        f"WorkingDirectory={systemd_quote(project_root)}",
-        f"ExecStart={systemd_quote(venv_py)} {systemd_quote(project_root / 'app.py')}",
-        "Restart=always",
-        "RestartSec=5",
-        "Environment=PYTHONUNBUFFERED=1",
-        "",
-        "[Install]",
-        "WantedBy=multi-user.target",
-        "",
-    ])
-    service_path.write_text(content, encoding="utf-8")
+    content = f"""[Unit]
+Description=CLIProxy Management Panel
+After=network.target
+
+[Service]
+Type=simple
+WorkingDirectory={systemd_quote(project_root)}
+ExecStart={systemd_quote(venv_py)} {systemd_quote(project_root / 'app.py')}
+Restart=always
+RestartSec=5
+Environment=PYTHONUNBUFFERED=1
+
+[Install]
+WantedBy=multi-user.target
+"""
+    service_path.write_bytes(content.encode("utf-8"))
     run(["systemctl", "daemon-reload"])
     run(["systemctl", "enable", service_name])
     if start_service:
@@ -146,7 +155,10 @@ def main():
         if is_windows:
             start_windows(project_root, venv_py)
         else:
-            run([venv_py, "app.py"], cwd=str(project_root))
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.chdir(project_root)
+            os.execv(venv_py, [venv_py, "app.py"])
 
 
 if __name__ == "__main__":